@@ -8,25 +8,64 @@ import fitz  # PyMuPDF
 from pptx import Presentation
 from pptx.util import Inches
 from PIL import Image
-import tempfile
+import io
 import logging
 from typing import Dict, Any, List
-import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # 导入基类
 from converters.converter_interface import ConverterInterface, ConverterMetadata
 
 logger = logging.getLogger('pdf_converter')
 
+# 每个子进程任务渲染的页数，页数少于此值时直接在当前进程渲染
+PAGES_PER_TASK = 8
+
+# 中间图像使用JPEG时的压缩质量
+JPEG_QUALITY = 85
+
+
+def _render_pages_worker(pdf_path, page_nums, dpi, image_format):
+    """批量渲染一组页面并编码为图像数据（顶层函数，便于ProcessPoolExecutor序列化）
+    
+    同一文档只打开一次，分摊每页的打开与初始化开销。
+    
+    Returns:
+        list: [(页码, 编码后的图像数据或None, 宽, 高), ...]
+    """
+    results = []
+    mat = fitz.Matrix(dpi/72, dpi/72)
+    use_jpeg = image_format.lower() in ('jpg', 'jpeg')
+    
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in page_nums:
+            try:
+                pix = doc[page_num].get_pixmap(matrix=mat)
+                buf = io.BytesIO()
+                # 渲染结果不含alpha通道（get_pixmap默认alpha=False），可直接编码为JPEG
+                if use_jpeg:
+                    pix.pil_save(buf, format='JPEG', quality=JPEG_QUALITY, optimize=False, progressive=False)
+                else:
+                    pix.pil_save(buf, format='PNG', optimize=False, compress_level=1)
+                results.append((page_num, buf.getvalue(), pix.width, pix.height))
+                pix = None
+            except Exception as e:
+                logger.error(f"渲染第 {page_num + 1} 页失败: {e}")
+                results.append((page_num, None, 0, 0))
+    finally:
+        doc.close()
+    
+    return results
+
+
 class PDFToPPTConverter(ConverterInterface):
     """PDF转PPT转换器
     
     将PDF文件的每一页转换为PPT幻灯片
     """
     
-    def __init__(self):
-        self._temp_files = []
-    
     @property
     def name(self) -> str:
         return "pdf_to_ppt"
@@ -80,7 +119,7 @@ class PDFToPPTConverter(ConverterInterface):
             output_path: 输出PPT文件路径
             **kwargs: 转换选项
                 - dpi: 图像分辨率 (默认150)
-                - image_format: 图像格式 ('png' 或 'jpeg')
+                - image_format: 图像格式 ('jpeg' 或 'png'，默认jpeg)
                 - start_page: 起始页码（从0开始）
                 - end_page: 结束页码
                 - slide_layout: 幻灯片布局索引
@@ -92,7 +131,7 @@ class PDFToPPTConverter(ConverterInterface):
         try:
             # 获取转换选项
             dpi = kwargs.get('dpi', 150)
-            image_format = kwargs.get('image_format', 'png')
+            image_format = kwargs.get('image_format', 'jpeg')
             start_page = kwargs.get('start_page', 0)
             end_page = kwargs.get('end_page', None)
             slide_layout = kwargs.get('slide_layout', 6)  # 空白布局
@@ -112,24 +151,38 @@ class PDFToPPTConverter(ConverterInterface):
             
             # 创建PowerPoint演示文稿
             prs = Presentation()
+            slide_layout_obj = prs.slide_layouts[slide_layout]
             
-            # 逐页转换
-            for page_num in range(start_page, min(end_page + 1, pdf_doc.page_count)):
-                logger.info(f"转换第 {page_num + 1} 页")
-                
-                page = pdf_doc[page_num]
-                
-                # 添加新幻灯片
-                slide_layout_obj = prs.slide_layouts[slide_layout]
-                slide = prs.slides.add_slide(slide_layout_obj)
-                
-                # 将PDF页面转换为图像
-                if self._add_page_as_image(page, slide, dpi, image_format):
-                    # 如果需要，添加文本内容
-                    if include_text:
-                        self._add_text_content(page, slide)
-                else:
-                    logger.warning(f"第 {page_num + 1} 页图像转换失败")
+            page_nums = list(range(start_page, min(end_page + 1, pdf_doc.page_count)))
+            chunks = [page_nums[i:i + PAGES_PER_TASK] for i in range(0, len(page_nums), PAGES_PER_TASK)]
+            max_workers = min(os.cpu_count() or 1, 4, len(chunks))
+            
+            if max_workers <= 1:
+                # 页数较少或单核时直接在当前进程逐批渲染
+                for chunk in chunks:
+                    for page_num, img_bytes, img_width, img_height in _render_pages_worker(
+                            input_path, chunk, dpi, image_format):
+                        self._add_rendered_page(prs, slide_layout_obj, pdf_doc, page_num,
+                                                img_bytes, img_width, img_height, dpi, include_text)
+            else:
+                # 分批交给进程池渲染，主进程按顺序插入已完成的批次，与后续批次的渲染重叠；
+                # 同时在途的批次数有上限，避免已编码的图像数据在内存中堆积
+                max_in_flight = max_workers * 2
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    in_flight = deque(executor.submit(_render_pages_worker, input_path, chunk, dpi, image_format)
+                                      for chunk in chunks[:max_in_flight])
+                    next_chunk = max_in_flight
+                    
+                    while in_flight:
+                        future = in_flight.popleft()
+                        if next_chunk < len(chunks):
+                            in_flight.append(executor.submit(_render_pages_worker, input_path, chunks[next_chunk],
+                                                             dpi, image_format))
+                            next_chunk += 1
+                        
+                        for page_num, img_bytes, img_width, img_height in future.result():
+                            self._add_rendered_page(prs, slide_layout_obj, pdf_doc, page_num,
+                                                    img_bytes, img_width, img_height, dpi, include_text)
             
             pdf_doc.close()
             
@@ -148,28 +201,29 @@ class PDFToPPTConverter(ConverterInterface):
             logger.error(f"PDF转PPT失败: {e}")
             return False
     
-    def _add_page_as_image(self, page, slide, dpi: int, image_format: str) -> bool:
-        """将PDF页面作为图像添加到幻灯片"""
+    def _add_rendered_page(self, prs, slide_layout_obj, pdf_doc, page_num: int, img_bytes, 
+                           img_width: int, img_height: int, dpi: int, include_text: bool):
+        """为已渲染的页面新建幻灯片并插入图像"""
+        logger.info(f"转换第 {page_num + 1} 页")
+        
+        # 添加新幻灯片
+        slide = prs.slides.add_slide(slide_layout_obj)
+        
+        if img_bytes and self._add_image_to_slide(slide, img_bytes, img_width, img_height, dpi):
+            # 如果需要，添加文本内容
+            if include_text:
+                self._add_text_content(pdf_doc[page_num], slide)
+        else:
+            logger.warning(f"第 {page_num + 1} 页图像转换失败")
+    
+    def _add_image_to_slide(self, slide, img_bytes: bytes, img_width: int, img_height: int, dpi: int) -> bool:
+        """将渲染好的页面图像添加到幻灯片"""
         try:
-            # 将PDF页面渲染为图像
-            mat = fitz.Matrix(dpi/72, dpi/72)  # 缩放矩阵
-            pix = page.get_pixmap(matrix=mat)
-            
-            # 转换为PIL图像
-            img_data = pix.tobytes(image_format)
-            img = Image.open(io.BytesIO(img_data))
-            
-            # 创建临时图像文件
-            temp_img_path = tempfile.mktemp(suffix=f'.{image_format}')
-            self._temp_files.append(temp_img_path)
-            img.save(temp_img_path)
-            
             # 计算图像在幻灯片中的位置和大小
             slide_width = Inches(10)  # 标准幻灯片宽度
             slide_height = Inches(7.5)  # 标准幻灯片高度
             
             # 计算缩放比例以适应幻灯片
-            img_width, img_height = img.size
             width_ratio = slide_width.inches / (img_width / dpi)
             height_ratio = slide_height.inches / (img_height / dpi)
             scale_ratio = min(width_ratio, height_ratio, 1.0)  # 不放大
@@ -181,7 +235,8 @@ class PDFToPPTConverter(ConverterInterface):
             top = (slide_height - final_height) / 2
             
             # 添加图像到幻灯片
-            slide.shapes.add_picture(temp_img_path, left, top, final_width, final_height)
+            # 直接从内存添加图像，无需临时文件
+            slide.shapes.add_picture(io.BytesIO(img_bytes), left, top, final_width, final_height)
             
             return True
             
@@ -218,7 +273,7 @@ class PDFToPPTConverter(ConverterInterface):
         """获取默认转换选项"""
         return {
             'dpi': 150,
-            'image_format': 'png',
+            'image_format': 'jpeg',
             'start_page': 0,
             'end_page': None,
             'slide_layout': 6,  # 空白布局
@@ -226,17 +281,6 @@ class PDFToPPTConverter(ConverterInterface):
             'preserve_aspect_ratio': True
         }
     
-    def cleanup(self):
-        """清理临时文件"""
-        for temp_file in self._temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except Exception as e:
-                logger.warning(f"清理临时文件失败: {temp_file}, {e}")
-        
-        self._temp_files.clear()
-    
     def _optimize_image_quality(self, img: Image.Image, target_size_mb: float = 1.0) -> Image.Image:
         """优化图像质量和大小"""
         try:
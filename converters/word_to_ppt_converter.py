@@ -5,12 +5,14 @@
 
 import os
 from docx import Document
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, NamedTuple
 import re
 
 # 导入基类
@@ -18,6 +20,59 @@ from converters.converter_interface import ConverterInterface, ConverterMetadata
 
 logger = logging.getLogger('pdf_converter')
 
+# 以阿拉伯数字或中文数字编号开头的标题，如 "1." "2、" "一、"
+_NUMBERED_TITLE_RE = re.compile(r'(?:\d+|[一二三四五六七八九十]+)[.、]')
+
+# 标题常见的首字符，以及句子结尾的标点（以此结尾的短文本不视为标题）
+_TITLE_START_CHARS = frozenset('第章节')
+_SENTENCE_END_CHARS = frozenset('。.!?')
+
+# Word正文中的段落和文字元素标签
+_W_P = qn('w:p')
+_W_T = qn('w:t')
+
+# 布局类型 -> 默认模板中的幻灯片布局序号
+_SLIDE_LAYOUTS = {
+    'title_content': 1,  # 标题和内容
+    'title_only': 5,     # 标题幻灯片
+    'content_only': 6,   # 空白幻灯片
+}
+
+# 手动添加的文本框和表格的位置、尺寸，导入时创建一次
+_TEXTBOX_LEFT = Inches(1)
+_TEXTBOX_TOP = Inches(1)
+_TEXTBOX_TOP_BELOW_TITLE = Inches(2)
+_TEXTBOX_WIDTH = Inches(8)
+_TEXTBOX_HEIGHT = Inches(5)
+
+_TABLE_LEFT = Inches(1)
+_TABLE_TOP = Inches(2.5)
+_TABLE_WIDTH = Inches(8)
+_TABLE_HEIGHT = Inches(4)
+_TABLE_FONT_SIZE = Pt(12)
+
+
+def _fill_text_frame(text_frame, lines: List[str], font_size):
+    """用lines替换文本框内容，每行一个段落并统一设置字号
+    
+    直接在txBody上追加a:p元素，不为每个段落创建_Paragraph/Font包装对象；
+    行内的换行符与 _Paragraph.text 一样转换为a:br。
+    """
+    sz = font_size.centipoints
+    txBody = text_frame._txBody
+    txBody.clear_content()
+    for line in lines:
+        p = txBody.add_p()
+        p.append_text(line)
+        p.get_or_add_pPr().get_or_add_defRPr().sz = sz
+
+
+class SlideData(NamedTuple):
+    """一张幻灯片的标题和内容行"""
+    title: str
+    content: List[str]
+
+
 class WordToPPTConverter(ConverterInterface):
     """Word转PPT转换器
     
@@ -141,13 +196,20 @@ class WordToPPTConverter(ConverterInterface):
             logger.error(f"Word转PPT失败: {e}")
             return False
     
-    def _parse_document_structure(self, doc: Document, max_content_per_slide: int, auto_split: bool) -> List[Dict[str, Any]]:
+    def _parse_document_structure(self, doc: Document, max_content_per_slide: int, auto_split: bool) -> List[SlideData]:
         """解析Word文档结构"""
         slides_data = []
-        current_slide = {'title': '', 'content': []}
+        current_slide = SlideData('', [])
         
         try:
-            for paragraph in doc.paragraphs:
+            # 逐个遍历正文中的段落元素，不预先生成整个doc.paragraphs列表；
+            # 没有任何文字的段落直接跳过，不创建Paragraph对象
+            body = doc._body
+            for p_element in body._element.iterchildren(_W_P):
+                if not any(t.text and not t.text.isspace() for t in p_element.iter(_W_T)):
+                    continue
+                
+                paragraph = Paragraph(p_element, body)
                 text = paragraph.text.strip()
                 if not text:
                     continue
@@ -155,37 +217,26 @@ class WordToPPTConverter(ConverterInterface):
                 # 判断是否为标题
                 if self._is_title(paragraph, text):
                     # 如果当前幻灯片有内容，保存它
-                    if current_slide['title'] or current_slide['content']:
+                    if current_slide.title or current_slide.content:
                         slides_data.append(current_slide)
                     
                     # 开始新幻灯片
-                    current_slide = {'title': text, 'content': []}
+                    current_slide = SlideData(text, [])
                 else:
                     # 添加到内容
-                    current_slide['content'].append(text)
+                    current_slide.content.append(text)
                     
                     # 如果启用自动分割且内容过多
-                    if auto_split and len(current_slide['content']) >= max_content_per_slide:
+                    if auto_split and len(current_slide.content) >= max_content_per_slide:
                         slides_data.append(current_slide)
                         # 继续使用相同标题创建新幻灯片
-                        current_slide = {
-                            'title': current_slide['title'] + ' (续)',
-                            'content': []
-                        }
+                        current_slide = SlideData(current_slide.title + ' (续)', [])
             
             # 添加最后一张幻灯片
-            if current_slide['title'] or current_slide['content']:
+            # 任何非空段落都会进入某张幻灯片，slides_data为空说明文档没有文本，无需再扫描一遍
+            if current_slide.title or current_slide.content:
                 slides_data.append(current_slide)
             
-            # 如果没有找到标题，创建默认结构
-            if not slides_data:
-                all_content = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-                if all_content:
-                    slides_data.append({
-                        'title': '文档内容',
-                        'content': all_content[:max_content_per_slide]
-                    })
-            
             logger.info(f"解析完成，共识别 {len(slides_data)} 张幻灯片")
             return slides_data
             
@@ -209,84 +260,63 @@ class WordToPPTConverter(ConverterInterface):
             
             # 检查文本特征
             # 短文本且不以句号结尾
-            if len(text) < 100 and not text.endswith(('。', '.', '!', '?')):
-                # 检查是否包含数字编号
-                if re.match(r'^\d+[.、]', text) or re.match(r'^[一二三四五六七八九十]+[、.]', text):
+            if len(text) < 100 and text[-1] not in _SENTENCE_END_CHARS:
+                # 检查是否以"第/章/节"开头或全大写
+                if text[0] in _TITLE_START_CHARS or text.isupper():
                     return True
                 
-                # 检查是否全大写或包含特殊格式
-                if text.isupper() or text.startswith(('第', '章', '节')):
+                # 检查是否包含数字编号
+                if _NUMBERED_TITLE_RE.match(text):
                     return True
             
             return False
             
         except Exception as e:
-            logger.warning(f"标题判断失败: {e}")
+            logger.warning("标题判断失败: %s", e)
             return False
     
-    def _create_slide(self, prs: Presentation, slide_data: Dict[str, Any], 
+    def _create_slide(self, prs: Presentation, slide_data: SlideData, 
                      layout_type: str, font_size_title: int, font_size_content: int):
         """创建幻灯片"""
         try:
-            # 选择布局
-            if layout_type == 'title_only':
-                layout = prs.slide_layouts[5]  # 标题幻灯片
-            elif layout_type == 'content_only':
-                layout = prs.slide_layouts[6]  # 空白幻灯片
-            else:  # title_content
-                layout = prs.slide_layouts[1]  # 标题和内容
+            # 选择布局，未知类型按title_content处理
+            layout = prs.slide_layouts[_SLIDE_LAYOUTS.get(layout_type, 1)]
             
             slide = prs.slides.add_slide(layout)
             
-            # 添加标题
-            if slide_data['title'] and hasattr(slide.shapes, 'title'):
-                title_shape = slide.shapes.title
-                title_shape.text = slide_data['title']
+            # 添加标题（空白布局没有标题占位符，title为None）
+            title_shape = slide.shapes.title if slide_data.title else None
+            if title_shape is not None:
+                title_shape.text = slide_data.title
                 
                 # 设置标题格式
-                title_frame = title_shape.text_frame
-                title_frame.paragraphs[0].font.size = Pt(font_size_title)
-                title_frame.paragraphs[0].font.bold = True
-                title_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+                title_paragraph = title_shape.text_frame.paragraphs[0]
+                title_font = title_paragraph.font
+                title_font.size = Pt(font_size_title)
+                title_font.bold = True
+                title_paragraph.alignment = PP_ALIGN.CENTER
             
             # 添加内容
-            if slide_data['content']:
-                if layout_type == 'title_content' and len(slide.placeholders) > 1:
+            if slide_data.content:
+                # 一次遍历查找内容占位符（idx为1）
+                content_placeholder = None
+                if layout_type == 'title_content':
+                    content_placeholder = next(
+                        (ph for ph in slide.placeholders if ph.placeholder_format.idx == 1), None)
+                
+                if content_placeholder is not None:
                     # 使用内容占位符
-                    content_shape = slide.placeholders[1]
-                    text_frame = content_shape.text_frame
-                    text_frame.clear()
-                    
-                    for i, content_line in enumerate(slide_data['content']):
-                        if i == 0:
-                            p = text_frame.paragraphs[0]
-                        else:
-                            p = text_frame.add_paragraph()
-                        
-                        p.text = content_line
-                        p.font.size = Pt(font_size_content)
-                        p.level = 0
+                    text_frame = content_placeholder.text_frame
                 else:
                     # 手动添加文本框
-                    left = Inches(1)
-                    top = Inches(2) if slide_data['title'] else Inches(1)
-                    width = Inches(8)
-                    height = Inches(5)
-                    
-                    textbox = slide.shapes.add_textbox(left, top, width, height)
+                    top = _TEXTBOX_TOP_BELOW_TITLE if slide_data.title else _TEXTBOX_TOP
+                    textbox = slide.shapes.add_textbox(_TEXTBOX_LEFT, top, _TEXTBOX_WIDTH, _TEXTBOX_HEIGHT)
                     text_frame = textbox.text_frame
-                    
-                    for i, content_line in enumerate(slide_data['content']):
-                        if i == 0:
-                            p = text_frame.paragraphs[0]
-                        else:
-                            p = text_frame.add_paragraph()
-                        
-                        p.text = content_line
-                        p.font.size = Pt(font_size_content)
+                
+                _fill_text_frame(text_frame, slide_data.content, Pt(font_size_content))
             
         except Exception as e:
-            logger.error(f"创建幻灯片失败: {e}")
+            logger.error("创建幻灯片失败: %s", e)
     
     def get_default_options(self) -> Dict[str, Any]:
         """获取默认转换选项"""
@@ -344,12 +374,8 @@ class WordToPPTConverter(ConverterInterface):
                 return
             
             # 添加表格
-            left = Inches(1)
-            top = Inches(2.5)
-            width = Inches(8)
-            height = Inches(4)
-            
-            table_shape = slide.shapes.add_table(rows, cols, left, top, width, height)
+            table_shape = slide.shapes.add_table(rows, cols, _TABLE_LEFT, _TABLE_TOP, 
+                                                 _TABLE_WIDTH, _TABLE_HEIGHT)
             table = table_shape.table
             
             # 填充表格数据
@@ -361,7 +387,7 @@ class WordToPPTConverter(ConverterInterface):
                         
                         # 设置字体
                         for paragraph in cell.text_frame.paragraphs:
-                            paragraph.font.size = Pt(12)
+                            paragraph.font.size = _TABLE_FONT_SIZE
             
         except Exception as e:
             logger.warning(f"添加表格失败: {e}")
@@ -3,10 +3,14 @@ import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import threading
+import queue
+import multiprocessing
 import fitz  # PyMuPDF
 from PIL import Image
 import docx
 from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from pdf2docx import parse
 import io
 import time
@@ -15,7 +19,7 @@ import re
 from typing import Dict, List, Optional
 
 # 导入工具模块
-from utils import get_resource_path
+from utils import get_resource_path, BackgroundFileWriter
 from pdf_operations import PDFOperations
 from scripts.dependency_checker import DependencyChecker, quick_dependency_check
 
@@ -23,6 +27,16 @@ from scripts.dependency_checker import DependencyChecker, quick_dependency_check
 from converters.converter_factory import ConverterFactory
 from converters.plugin_manager import get_plugin_manager, initialize_plugins
 
+# 文本提取使用的TextPage标志（展开连字，保留空白）
+TEXTPAGE_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
+# PDF扩展名匹配（忽略大小写，避免每个文件名都调用lower()）
+PDF_SUFFIX_RE = re.compile(r'\.pdf\Z', re.I)
+
+# 超大页面分块渲染：位图超过该字节数时按TILE_SIZE像素分块渲染后拼接
+TILED_RENDER_THRESHOLD = 256 << 20
+TILE_SIZE = 2048
+
 class PDFConverter:
     def __init__(self):
         # 在创建GUI之前进行依赖检查
@@ -39,6 +53,9 @@ class PDFConverter:
         # 停止转换标志
         self.stop_conversion_flag = False
         
+        # 工作线程投递的界面更新队列，由主线程定时批量处理
+        self._ui_queue = queue.Queue()
+        
         # 设置应用图标
         try:
             from PIL import Image, ImageTk
@@ -92,6 +109,9 @@ class PDFConverter:
         
         self.setup_ui()
         
+        # 启动界面更新队列的定时处理
+        self.root.after(100, self._drain_ui_queue)
+        
     def setup_ui(self):
         # 创建主框架
         main_frame = ttk.Frame(self.root, padding="10")
@@ -238,6 +258,10 @@ class PDFConverter:
         ttk.Radiobutton(self.image_format_frame, text="JPG格式", variable=self.image_format_var, value="jpg").pack(anchor=tk.W, padx=20)
         ttk.Radiobutton(self.image_format_frame, text="PNG格式", variable=self.image_format_var, value="png").pack(anchor=tk.W, padx=20)
         
+        # 灰度输出（适用于扫描文档，像素数据量仅为彩色的1/3）
+        self.gray_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.image_format_frame, text="灰度输出（适用于黑白扫描件）", variable=self.gray_var).pack(anchor=tk.W, padx=20, pady=(5, 0))
+        
         # PPT转换选项（针对转PPT功能）
         self.ppt_frame = ttk.Frame(self.options_frame)
         self.ppt_frame.pack(fill=tk.X, pady=(0, 10))
@@ -565,22 +589,93 @@ class PDFConverter:
             message: 日志消息
             update_last_line: 是否更新最后一行（用于进度显示）
         """
-        if update_last_line:
-            # 只有当上一条日志也是进度信息时才删除上一行
-            if self.last_log_was_progress:
-                try:
-                    # 删除最后一行
-                    self.log_text.delete("end-2l", "end-1l")
-                except:
-                    pass  # 如果删除失败就忽略
-            self.log_text.insert(tk.END, f"{message}\n")
-            self.last_log_was_progress = True
-        else:
-            self.log_text.insert(tk.END, f"{message}\n")
-            self.last_log_was_progress = False
-        self.log_text.see(tk.END)
+        if threading.current_thread() is not threading.main_thread():
+            # 工作线程中不直接操作Tk控件，交由主线程批量写入
+            self._post_ui("log", (message, update_last_line))
+            return
+        
+        self._write_log_lines([(message, update_last_line)])
         self.root.update_idletasks()  # 立即更新UI
     
+    def _write_log_lines(self, entries):
+        """将多条日志合并为一次插入写入日志框
+        Args:
+            entries: (message, update_last_line) 元组列表
+        """
+        lines = []
+        for message, update_last_line in entries:
+            # 只有当上一条日志也是进度信息时才替换上一行
+            if update_last_line and self.last_log_was_progress:
+                if lines:
+                    lines.pop()
+                else:
+                    try:
+                        # 删除最后一行
+                        self.log_text.delete("end-2l", "end-1l")
+                    except:
+                        pass  # 如果删除失败就忽略
+            lines.append(message)
+            self.last_log_was_progress = update_last_line
+        
+        if lines:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.log_text.see(tk.END)
+    
+    def _post_ui(self, kind, value):
+        """从工作线程投递界面更新（log/status/progress/call，call的值为无参可调用对象）"""
+        self._ui_queue.put((kind, value))
+    
+    def _ask_ui(self, func, *args, **kwargs):
+        """在主线程中执行对话框等调用并等待其返回值（仅供工作线程使用）"""
+        done = threading.Event()
+        result = []
+        
+        def run():
+            try:
+                result.append(func(*args, **kwargs))
+            finally:
+                done.set()
+        
+        self._post_ui("call", run)
+        done.wait()
+        return result[0] if result else None
+    
+    def _drain_ui_queue(self):
+        """在主线程中批量处理界面更新：日志合并插入，状态和进度只取最新值，
+        call在本批日志写入之后按投递顺序执行"""
+        log_entries = []
+        status = None
+        progress = None
+        calls = []
+        
+        try:
+            for _ in range(200):
+                kind, value = self._ui_queue.get_nowait()
+                if kind == "log":
+                    log_entries.append(value)
+                elif kind == "status":
+                    status = value
+                elif kind == "progress":
+                    progress = value
+                elif kind == "call":
+                    calls.append(value)
+        except queue.Empty:
+            pass
+        
+        if log_entries:
+            self._write_log_lines(log_entries)
+        if status is not None:
+            self.status_var.set(status)
+        if progress is not None:
+            self.progress_var.set(progress)
+        for call in calls:
+            try:
+                call()
+            except Exception as e:
+                self.log_error("界面回调执行失败", e)
+        
+        self.root.after(100, self._drain_ui_queue)
+    
     def log_progress(self, current, total, message=""):
         """显示进度信息（同行更新）"""
         progress_msg = f"当前处理进度: {current}/{total}"
@@ -674,6 +769,7 @@ class PDFConverter:
         mode = self.mode_var.get()
         output_format = self.format_var.get()
         dpi = int(self.dpi_var.get()) if mode == "image" else None
+        grayscale = self.gray_var.get() if mode == "image" else False
         
         # 重置停止标志
         self.stop_conversion_flag = False
@@ -683,25 +779,26 @@ class PDFConverter:
         self.stop_btn.config(state="normal")
         
         # 在新线程中执行转换，避免UI冻结
-        threading.Thread(target=self.conversion_thread, args=(input_path, output_dir, mode, output_format, dpi), daemon=True).start()
+        threading.Thread(target=self.conversion_thread, args=(input_path, output_dir, mode, output_format, dpi, grayscale), daemon=True).start()
     
-    def conversion_thread(self, input_path, output_dir, mode, output_format, dpi):
+    def conversion_thread(self, input_path, output_dir, mode, output_format, dpi, grayscale=False):
         try:
-            self.status_var.set("正在准备转换...")
-            self.progress_var.set(0)
+            self._post_ui("status", "正在准备转换...")
+            self._post_ui("progress", 0)
             
             # 确定要处理的文件列表
             pdf_files = []
-            if os.path.isfile(input_path) and input_path.lower().endswith('.pdf'):
+            if os.path.isfile(input_path) and PDF_SUFFIX_RE.search(input_path):
                 pdf_files = [input_path]
             elif os.path.isdir(input_path):
-                for file in os.listdir(input_path):
-                    if file.lower().endswith('.pdf'):
-                        pdf_files.append(os.path.join(input_path, file))
+                # scandir自带目录项类型信息，无需额外join和stat
+                with os.scandir(input_path) as entries:
+                    pdf_files = [entry.path for entry in entries
+                                 if PDF_SUFFIX_RE.search(entry.name) and entry.is_file()]
             
             if not pdf_files:
-                self.status_var.set("未找到PDF文件")
-                messagebox.showinfo("信息", "未找到PDF文件")
+                self._post_ui("status", "未找到PDF文件")
+                self._post_ui("call", lambda: messagebox.showinfo("信息", "未找到PDF文件"))
                 return
             
             total_files = len(pdf_files)
@@ -747,12 +844,20 @@ class PDFConverter:
             if existing_files:
                 file_list = "\n".join(existing_files)
                 message = f"以下文件已存在：\n\n{file_list}\n\n是否要覆盖这些文件？"
-                result = messagebox.askyesno("文件已存在", message, icon="warning")
+                result = self._ask_ui(messagebox.askyesno, "文件已存在", message, icon="warning")
                 if not result:
-                    self.status_var.set("转换已取消")
+                    self._post_ui("status", "转换已取消")
                     self.log("用户取消转换操作")
                     return
             
+            # 根据模式和格式一次性选定转换函数，循环内不再逐个分支判断
+            convert_fn = self._pick_converter(mode, output_format, dpi, grayscale)
+            if convert_fn is None:
+                self._post_ui("status", f"不支持的输出格式: {output_format}")
+                self.log_error(f"不支持的输出格式: {output_format}")
+                self._post_ui("call", self._reset_buttons)
+                return
+            
             # 开始转换
             successful = 0
             failed = 0
@@ -760,32 +865,17 @@ class PDFConverter:
             for i, pdf_file in enumerate(pdf_files):
                 # 检查是否需要停止转换
                 if self.stop_conversion_flag:
-                    self.status_var.set("转换已停止")
+                    self._post_ui("status", "转换已停止")
                     self.log("用户停止了转换操作")
-                    self._reset_buttons()
+                    self._post_ui("call", self._reset_buttons)
                     return
                 
                 file_name = os.path.basename(pdf_file)
-                self.status_var.set(f"正在转换 {file_name} ({i+1}/{total_files})")
+                self._post_ui("status", f"正在转换 {file_name} ({i+1}/{total_files})")
                 # 文件级别进度显示已精简
                 
                 try:
-                    if mode == "document":
-                        if output_format == "docx":
-                            # OCR选项已移除
-                            self.convert_to_docx(pdf_file, output_dir)
-                        elif output_format == "pptx":
-                            self.convert_to_pptx(pdf_file, output_dir)
-                        elif output_format == "pptx_via_word":
-                            self.convert_to_pptx_via_word(pdf_file, output_dir)
-                        elif output_format == "txt":
-                            self.convert_to_txt(pdf_file, output_dir)
-                    elif mode == "upscale":
-                        # PDF高清化模式 - 使用插件系统
-                        upscale_method = output_format.replace("upscale_", "")
-                        self._convert_using_upscale_plugin(pdf_file, output_dir, upscale_method)
-                    else:  # image mode
-                        self.convert_to_image(pdf_file, output_dir, output_format, dpi)
+                    convert_fn(pdf_file, output_dir)
                     
                     successful += 1
                     # 单文件转换成功日志已精简
@@ -795,25 +885,57 @@ class PDFConverter:
                 
                 # 更新进度
                 progress = (i + 1) / total_files * 100
-                self.progress_var.set(progress)
+                self._post_ui("progress", progress)
             
             # 完成
-            self.status_var.set(f"转换完成: {successful}成功, {failed}失败")
+            self._post_ui("status", f"转换完成: {successful}成功, {failed}失败")
             self.log_success(f"批量转换完成 - 成功: {successful}, 失败: {failed}")
-            self._reset_buttons()
-            messagebox.showinfo("完成", f"转换完成\n成功: {successful}\n失败: {failed}")
+            self._post_ui("call", self._reset_buttons)
+            self._post_ui("call", lambda: messagebox.showinfo("完成", f"转换完成\n成功: {successful}\n失败: {failed}"))
             
         except Exception as e:
-            self.status_var.set(f"转换过程中发生错误: {str(e)}")
+            self._post_ui("status", f"转换过程中发生错误: {str(e)}")
             self.log(f"错误: {str(e)}")
-            self._reset_buttons()
-            messagebox.showerror("错误", f"转换过程中发生错误: {str(e)}")
+            error_message = f"转换过程中发生错误: {str(e)}"
+            self._post_ui("call", self._reset_buttons)
+            self._post_ui("call", lambda: messagebox.showerror("错误", error_message))
+    
+    def _pick_converter(self, mode, output_format, dpi, grayscale):
+        """根据转换模式和输出格式选定单文件转换函数
+        
+        Returns:
+            可调用对象 convert_fn(pdf_file, output_dir)；不支持的格式返回None
+        """
+        if mode == "upscale":
+            # PDF高清化模式 - 使用插件系统
+            upscale_method = output_format.replace("upscale_", "")
+            return lambda pdf_file, output_dir: self._convert_using_upscale_plugin(pdf_file, output_dir, upscale_method)
+        
+        if mode == "image":
+            return lambda pdf_file, output_dir: self._convert_with_document(
+                pdf_file, output_dir, self.convert_to_image, output_format, dpi, grayscale)
+        
+        # document mode（OCR选项已移除）
+        return {
+            "docx": self.convert_to_docx,
+            "pptx": self.convert_to_pptx,
+            "pptx_via_word": self.convert_to_pptx_via_word,
+            "txt": lambda pdf_file, output_dir: self._convert_with_document(
+                pdf_file, output_dir, self.convert_to_txt),
+        }.get(output_format)
+    
+    def _convert_with_document(self, pdf_file, output_dir, convert, *args):
+        """打开PDF并交给基于文档对象的转换函数，每个文件只打开一次"""
+        base_name = os.path.splitext(os.path.basename(pdf_file))[0]
+        with fitz.open(pdf_file, filetype="pdf") as pdf_document:
+            return convert(pdf_document, base_name, output_dir, *args)
     
     def stop_conversion(self):
         """停止当前转换任务"""
         self.stop_conversion_flag = True
-        self.status_var.set("正在停止转换...")
-        self.log("用户请求停止转换")
+        # 与工作线程的更新走同一队列，避免队列中尚未处理的旧状态和日志覆盖或排到停止提示之后
+        self._post_ui("status", "正在停止转换...")
+        self._post_ui("log", ("用户请求停止转换", False))
     
     def _reset_buttons(self):
         """重置按钮状态"""
@@ -1197,30 +1319,39 @@ class PDFConverter:
         
             # 创建一个新的Word文档
             doc = Document()
+            heading_style_id = doc.styles['Heading 1'].style_id
             
             # 打开PDF文件
             pdf_document = fitz.open(pdf_path)
+            total_pages = len(pdf_document)
             
-            # 遍历每一页
-            for page_num in range(len(pdf_document)):
+            # 先在内存中构建所有段落元素，最后一次性追加到文档主体，
+            # 避免逐页调用add_heading/add_paragraph/add_page_break
+            paragraphs = []
+            for page_num in range(total_pages):
                 page = pdf_document.load_page(page_num)
-                text = page.get_text("text")
+                textpage = page.get_textpage(flags=TEXTPAGE_FLAGS)
+                text = textpage.extractText()
+                textpage = None
                 
                 # 清理文本中的XML不兼容字符
                 cleaned_text = self._clean_text_for_xml(text)
                 
-                # 添加页码标题
-                doc.add_heading(f"Page {page_num + 1}", level=1)
-                
-                # 添加文本内容（只有在有内容时才添加）
-                if cleaned_text.strip():
-                    doc.add_paragraph(cleaned_text)
-                else:
-                    doc.add_paragraph("[此页无可提取的文本内容]")
+                # 页码标题
+                paragraphs.append(self._make_docx_paragraph(f"Page {page_num + 1}", style_id=heading_style_id))
                 
-                # 添加分页符（除了最后一页）
-                if page_num < len(pdf_document) - 1:
-                    doc.add_page_break()
+                # 文本内容（无内容时写入占位说明），除最后一页外在段末插入分页符
+                paragraphs.append(self._make_docx_paragraph(
+                    cleaned_text if cleaned_text.strip() else "[此页无可提取的文本内容]",
+                    page_break=page_num < total_pages - 1
+                ))
+            
+            body = doc.element.body
+            sect_pr = body.sectPr
+            body.extend(paragraphs)
+            # sectPr必须是body的最后一个子元素
+            if sect_pr is not None:
+                body.append(sect_pr)
             
             # 保存Word文档
             doc.save(output_path)
@@ -1231,6 +1362,30 @@ class PDFConverter:
             self.log(f"✗ 备用方法转换失败: {base_name}.pdf - {str(e)}")
             raise e
     
+    def _make_docx_paragraph(self, text, style_id=None, page_break=False):
+        """直接构建<w:p>段落元素，供批量追加到文档主体"""
+        paragraph = OxmlElement('w:p')
+        if style_id:
+            p_pr = OxmlElement('w:pPr')
+            p_style = OxmlElement('w:pStyle')
+            p_style.set(qn('w:val'), style_id)
+            p_pr.append(p_style)
+            paragraph.append(p_pr)
+        
+        run = OxmlElement('w:r')
+        text_element = OxmlElement('w:t')
+        text_element.set(qn('xml:space'), 'preserve')
+        text_element.text = text
+        run.append(text_element)
+        
+        if page_break:
+            br = OxmlElement('w:br')
+            br.set(qn('w:type'), 'page')
+            run.append(br)
+        
+        paragraph.append(run)
+        return paragraph
+    
     def _clean_text_for_xml(self, text):
         """清理文本中的XML不兼容字符"""
         if not text:
@@ -1260,36 +1415,38 @@ class PDFConverter:
         
         return cleaned_text.strip()
     
-    def convert_to_txt(self, pdf_path, output_dir):
-        # 获取文件名（不含扩展名）
-        base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    def convert_to_txt(self, pdf_document, base_name, output_dir):
+        """将已打开的PDF文档转换为TXT文本
+        
+        Args:
+            pdf_document: 已打开的fitz.Document，由调用方负责关闭
+            base_name: 输出文件名（不含扩展名）
+            output_dir: 输出目录
+        """
         # 确保路径使用正确的分隔符
         output_path = os.path.normpath(os.path.join(output_dir, f"{base_name}.txt"))
         
         self.log_step("文本转换", f"开始转换 {base_name}.pdf")
         
-        # 打开PDF文件
-        pdf_document = fitz.open(pdf_path)
         total_pages = len(pdf_document)
         self.log(f"PDF总页数: {total_pages}")
         
-        # 创建文本文件
-        with open(output_path, 'w', encoding='utf-8') as txt_file:
+        # 创建文本文件：文本模式按平台换行符写出（与原先一致），
+        # 由文件对象自身的1MB缓冲合并写入，减少系统调用
+        with open(output_path, 'w', encoding='utf-8', newline=os.linesep, buffering=1 << 20) as txt_file:
             # 遍历每一页
             for page_num in range(total_pages):
                 self.log_progress(page_num + 1, total_pages, f"提取页面 {page_num + 1} 文本")
                 
                 page = pdf_document.load_page(page_num)
-                text = page.get_text("text")
-                
-                # 写入页码标题
-                txt_file.write(f"===== Page {page_num + 1} =====\n\n")
+                # 显式创建TextPage并立即释放，避免get_text内部按默认标志重复构建
+                textpage = page.get_textpage(flags=TEXTPAGE_FLAGS)
+                text = textpage.extractText()
+                textpage = None
                 
-                # 写入文本内容
-                txt_file.write(text)
-                txt_file.write("\n\n")
+                # 页码标题 + 文本内容
+                txt_file.write(f"===== Page {page_num + 1} =====\n\n{text}\n\n")
         
-        pdf_document.close()
         self.log_success(f"文本转换完成: {base_name}.txt")
     
     def _convert_using_upscale_plugin(self, pdf_path, output_dir, upscale_method):
@@ -1498,10 +1655,17 @@ class PDFConverter:
         doc.save(output_path)
         self.log_success(f"备用方法转换完成: {total_pages} 页文本已提取")
     
-    def convert_to_image(self, pdf_path, output_dir, image_format, dpi):
-        # 获取文件名（不含扩展名）
-        base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    def convert_to_image(self, pdf_document, base_name, output_dir, image_format, dpi, grayscale=False):
+        """将已打开的PDF文档逐页渲染为图片
         
+        Args:
+            pdf_document: 已打开的fitz.Document，由调用方负责关闭
+            base_name: 输出文件名前缀（不含扩展名）
+            output_dir: 输出目录
+            image_format: 图片格式（jpg/png）
+            dpi: 渲染分辨率
+            grayscale: 是否以8位灰度渲染
+        """
         # 清理文件名中的非法字符，确保可以创建文件夹
         safe_folder_name = self.sanitize_filename(base_name)
         
@@ -1512,8 +1676,6 @@ class PDFConverter:
         self.log_step("图像转换", f"开始转换 {base_name}.pdf 为 {image_format.upper()} (DPI: {dpi})")
         self.log(f"图片将保存到文件夹: {safe_folder_name}")
         
-        # 打开PDF文件
-        pdf_document = fitz.open(pdf_path)
         total_pages = len(pdf_document)
         self.log(f"PDF总页数: {total_pages}")
         
@@ -1521,33 +1683,86 @@ class PDFConverter:
         zoom = dpi / 72  # PDF使用72 DPI作为基准
         self.log(f"缩放因子: {zoom:.2f}")
         
-        # 遍历每一页
-        for page_num in range(total_pages):
-            self.log_progress(page_num + 1, total_pages, f"渲染页面 {page_num + 1}")
-            
-            try:
-                page = pdf_document.load_page(page_num)
-                
-                # 渲染页面为像素图
-                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
-                
-                # 将像素图转换为PIL图像
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                
-                # 保存图像到PDF文件名命名的文件夹中
-                output_path = os.path.join(pdf_output_dir, f"{base_name}_page{page_num + 1}.{image_format}")
+        colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+        if grayscale:
+            self.log("使用灰度模式渲染")
+        
+        # 循环内不变的量提前计算
+        mat = fitz.Matrix(zoom, zoom)
+        is_jpg = image_format.lower() == "jpg"
+        path_prefix = os.path.join(pdf_output_dir, f"{base_name}_page")
+        
+        # 编码后的图片交给后台线程写盘，渲染下一页时不必等待磁盘
+        writer = BackgroundFileWriter()
+        
+        try:
+            # 遍历每一页
+            for page_num in range(total_pages):
+                self.log_progress(page_num + 1, total_pages, f"渲染页面 {page_num + 1}")
                 
-                if image_format.lower() == "jpg":
-                    img.save(output_path, "JPEG", quality=95)
-                else:  # png
-                    img.save(output_path, "PNG")
+                try:
+                    page = pdf_document.load_page(page_num)
                     
-            except Exception as e:
-                self.log_error(f"页面 {page_num + 1} 转换失败", e)
+                    # 保存图像到PDF文件名命名的文件夹中
+                    output_path = f"{path_prefix}{page_num + 1}.{image_format}"
+                    
+                    # 按get_pixmap相同的取整方式估算整页位图大小，超大页面改为分块渲染
+                    irect = (page.rect * mat).irect
+                    if irect.width * irect.height * colorspace.n > TILED_RENDER_THRESHOLD:
+                        self.log(f"页面 {page_num + 1} 尺寸较大 ({irect.width}x{irect.height})，使用分块渲染")
+                        img = self._render_page_tiled(page, mat, colorspace, irect)
+                        if is_jpg:
+                            img.save(output_path, "JPEG", quality=95)
+                        else:  # png
+                            img.save(output_path, "PNG")
+                        img = None
+                        continue
+                    
+                    # 渲染页面为像素图
+                    pix = page.get_pixmap(matrix=mat, colorspace=colorspace, alpha=False)
+                    
+                    # 直接由PyMuPDF编码，不经过PIL中转
+                    if is_jpg:
+                        writer.submit(output_path, pix.tobytes("jpg", jpg_quality=95))
+                    else:  # png
+                        writer.submit(output_path, pix.tobytes("png"))
+                    pix = None
+                        
+                except Exception as e:
+                    self.log_error(f"页面 {page_num + 1} 转换失败", e)
+        finally:
+            # 渲染中途出现异常也要等待已提交的写入完成，并结束后台线程
+            write_errors = writer.drain()
+        
+        for failed_path, error in write_errors:
+            self.log_error(f"图片写入失败: {os.path.basename(failed_path)}", error)
         
-        pdf_document.close()
         self.log_success(f"图像转换完成: {total_pages} 页已转换为 {image_format.upper()}")
     
+    def _render_page_tiled(self, page, mat, colorspace, irect):
+        """按TILE_SIZE分块渲染页面并拼接为一张PIL图像
+        
+        输出尺寸和分块边界均取自整页渲染的irect，与get_pixmap整页渲染结果一致。
+        每块渲染后立即释放对应的Pixmap，MuPDF不再申请整页大小的像素缓冲和编码缓冲；
+        但拼接目标仍是整页大小的PIL图像，峰值内存约为一份整页位图，而非与分块大小无关。
+        """
+        inverse = ~mat
+        mode = "L" if colorspace.n == 1 else "RGB"
+        img = Image.new(mode, (irect.width, irect.height))
+        
+        for ty in range(irect.y0, irect.y1, TILE_SIZE):
+            for tx in range(irect.x0, irect.x1, TILE_SIZE):
+                tile_rect = fitz.IRect(tx, ty, min(tx + TILE_SIZE, irect.x1), min(ty + TILE_SIZE, irect.y1))
+                pix = page.get_pixmap(matrix=mat, clip=fitz.Rect(tile_rect) * inverse,
+                                      colorspace=colorspace, alpha=False)
+                # samples_mv直接引用MuPDF的像素缓冲区，不复制；paste完成前pix必须保持存活
+                tile = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv, "raw", mode, 0, 1)
+                img.paste(tile, (pix.x - irect.x0, pix.y - irect.y0))
+                tile = None
+                pix = None
+        
+        return img
+    
     def setup_convert_mode_ui(self):
         """设置转换模式的UI"""
         pass  # UI已经在setup_ui中设置
@@ -1719,4 +1934,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，进程池的子进程需要此调用才能正常启动
+    multiprocessing.freeze_support()
     main()
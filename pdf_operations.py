@@ -3,17 +3,144 @@ from tkinter import ttk, filedialog, messagebox
 import fitz  # PyMuPDF
 from PIL import Image, ImageTk
 import os
-import io
+import hashlib
+import tempfile
+import queue
 import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from converters.pdf_text_remover import PDFTextRemover
 
+logger = logging.getLogger('pdf_converter')
+
+# 缩略图磁盘缓存目录及容量上限，超出后按最近使用时间淘汰
+THUMB_CACHE_DIR = os.path.join(tempfile.gettempdir(), "2anythings_thumbs")
+THUMB_CACHE_MAX_BYTES = 64 << 20
+
+# 可视区域上下额外保留的缩略图行数，超出范围的缩略图控件会被释放
+THUMB_KEEP_MARGIN_ROWS = 2
+
+# 缩略图生产队列上限，以及主线程每次取出的数量和取出间隔
+THUMB_QUEUE_SIZE = 16
+THUMB_PUMP_BATCH = 4
+THUMB_PUMP_INTERVAL_MS = 30
+
+# 需要渲染的页数不少于此值时才使用进程池，每个子进程任务渲染的页数
+THUMB_POOL_MIN_PAGES = 32
+THUMB_PAGES_PER_TASK = 8
+
+
+def _fit_zoom(page, target_size):
+    """计算使页面恰好适配目标尺寸 (宽, 高) 的缩放倍数"""
+    rect = page.rect
+    return min(target_size[0] / rect.width, target_size[1] / rect.height)
+
+
+def _render_thumbnail(page, target_size, color):
+    """按目标尺寸渲染页面缩略图，非彩色时使用灰度以减少像素数据量
+    
+    Returns:
+        (图像模式, 宽, 高, 原始像素数据)
+    """
+    zoom = _fit_zoom(page, target_size)
+    colorspace = fitz.csRGB if color else fitz.csGRAY
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=colorspace, alpha=False)
+    return ("RGB" if color else "L"), pix.width, pix.height, pix.samples
+
+
+def _render_pages_worker(pdf_path, page_nums, target_size, color):
+    """在子进程中按目标尺寸渲染一组页面（顶层函数，便于ProcessPoolExecutor序列化）
+    
+    同一文档只打开一次。
+    
+    Returns:
+        list: [(页码, (图像模式, 宽, 高, 原始像素数据) 或 None), ...]
+    """
+    results = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in page_nums:
+            try:
+                results.append((page_num, _render_thumbnail(doc[page_num], target_size, color)))
+            except Exception as e:
+                logger.error(f"渲染第{page_num + 1}页缩略图失败: {e}")
+                results.append((page_num, None))
+    finally:
+        doc.close()
+    return results
+
+
+def _thumb_cache_path(cache_key, page_num, thumbnail_size, color):
+    """获取指定文件、页面、尺寸和颜色模式的缩略图缓存文件路径"""
+    width, height = thumbnail_size
+    suffix = "rgb" if color else "gray"
+    return os.path.join(THUMB_CACHE_DIR, f"{cache_key}_{page_num}_{width}x{height}_{suffix}.png")
+
+
+def _load_cached_thumbnail(cache_path):
+    """读取缓存的缩略图，未命中或读取失败时返回None
+    
+    Returns:
+        (图像模式, 宽, 高, 原始像素数据) 或 None
+    """
+    try:
+        with Image.open(cache_path) as cached:
+            cached.load()
+            pil_image = cached if cached.mode in ("L", "RGB") else cached.convert("RGB")
+        # 刷新修改时间，作为LRU淘汰依据
+        os.utime(cache_path)
+    except OSError:
+        return None
+    return pil_image.mode, pil_image.width, pil_image.height, pil_image.tobytes()
+
+
+def _store_cached_thumbnail(cache_path, img_data):
+    """将渲染好的缩略图写入缓存，失败时忽略"""
+    mode, width, height, samples = img_data
+    try:
+        os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+        Image.frombytes(mode, (width, height), samples).save(
+            cache_path, "PNG", optimize=False, compress_level=1)
+    except OSError as e:
+        logger.warning(f"写入缩略图缓存失败: {e}")
+
+
+def _evict_thumb_cache(max_bytes=THUMB_CACHE_MAX_BYTES):
+    """缓存目录超过容量上限时，从最久未使用的文件开始删除"""
+    try:
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                   for entry in os.scandir(THUMB_CACHE_DIR) if entry.is_file()]
+    except OSError:
+        return
+    
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
 class PDFOperations:
     def __init__(self, parent_window):
         self.parent = parent_window
         self.pdf_document = None
         self.pdf_path = ""
-        self.page_thumbnails = []
+        self.page_thumbnails = {}
         self.selected_pages = set()
+        self._thumb_cache_key = None
+        self._thumb_layout = None
+        self._thumb_color = False
+        self._thumb_queue = None
+        self._thumb_row_height = None
+        self._thumb_refresh_after_id = None
         self.ui_frame = None
         self.current_operation = "delete_pages"
         self.text_remover = PDFTextRemover()
@@ -29,6 +156,8 @@ class PDFOperations:
     def hide_ui(self):
         """隐藏PDF操作界面"""
         if hasattr(self, 'main_frame') and self.main_frame:
+            if hasattr(self, 'canvas') and self.canvas.winfo_exists():
+                self.canvas.unbind_all("<MouseWheel>")
             for widget in self.main_frame.winfo_children():
                 widget.destroy()
     
@@ -89,6 +218,11 @@ class PDFOperations:
         ttk.Button(button_frame, text="选择PDF文件", command=self.browse_pdf_file).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="加载页面", command=self.load_pdf_pages).pack(side=tk.LEFT, padx=(0, 10))
         
+        # 缩略图默认灰度渲染，需要核对颜色时可切换为彩色
+        self.color_preview_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="彩色预览", variable=self.color_preview_var,
+                        command=self._on_color_preview_toggle).pack(side=tk.LEFT, padx=(0, 10))
+        
         # 页面预览区域
         preview_frame = ttk.LabelFrame(self.main_frame, text="页面预览 (勾选要删除的页面)", padding="15")
         preview_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
@@ -101,22 +235,23 @@ class PDFOperations:
         scrollbar_v = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.canvas.yview)
         scrollbar_h = ttk.Scrollbar(canvas_frame, orient="horizontal", command=self.canvas.xview)
         
+        # 滚动区域由缩略图网格尺寸直接算出（见_finalize_thumbnail），无需每次布局变化时查询bbox
         self.scrollable_frame = ttk.Frame(self.canvas)
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
         
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
+        # 滚动位置或可视区域变化时，同步释放/重建可视区域外的缩略图
+        def on_yscroll(first, last):
+            scrollbar_v.set(first, last)
+            self._schedule_thumbnail_refresh()
+        
+        self.canvas.configure(yscrollcommand=on_yscroll, xscrollcommand=scrollbar_h.set)
         
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar_v.pack(side="right", fill="y")
         scrollbar_h.pack(side="bottom", fill="x")
         
-        # 绑定鼠标滚轮事件到canvas和scrollable_frame
-        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", self._on_mousewheel)
+        # 全局绑定一次鼠标滚轮事件，由处理函数判断鼠标是否位于预览区域内
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
         
         # 绑定鼠标进入事件以获取焦点
         def on_enter(event):
@@ -167,59 +302,217 @@ class PDFOperations:
             # 打开PDF文档
             self.pdf_document = fitz.open(self.pdf_path)
             
-            # 清空之前的缩略图
+            # 清空之前的缩略图及行高设置
             for widget in self.scrollable_frame.winfo_children():
                 widget.destroy()
-            
-            self.page_thumbnails = []
+            columns, rows = self.scrollable_frame.grid_size()
+            for row in range(rows):
+                self.scrollable_frame.grid_rowconfigure(row, minsize=0)
+            for col in range(columns):
+                self.scrollable_frame.grid_columnconfigure(col, minsize=0)
+            self.canvas.configure(scrollregion=(0, 0, 0, 0))
+            
+            self.page_thumbnails = {}
+            self._thumb_row_height = None
             self.selected_pages = set()
             
+            # 缓存键由文件路径和修改时间决定，文件变化后旧缓存自然失效
+            stat = os.stat(self.pdf_path)
+            key_source = f"{os.path.abspath(self.pdf_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+            self._thumb_cache_key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()
+            
             # 创建页面缩略图
             self._create_thumbnails()
             
         except Exception as e:
             messagebox.showerror("错误", f"加载PDF文件失败: {str(e)}")
             
+    def _on_color_preview_toggle(self):
+        """切换彩色/灰度预览后重新生成缩略图，保留已选页面"""
+        if not self.pdf_document:
+            return
+        
+        for thumbnail in self.page_thumbnails.values():
+            if thumbnail['frame'] is not None:
+                thumbnail['frame'].destroy()
+                thumbnail['frame'] = None
+                thumbnail['image'] = None
+        
+        self._create_thumbnails()
+        
     def _create_thumbnails(self):
         """创建页面缩略图"""
-        # 在新线程中生成缩略图，避免界面卡顿
-        threading.Thread(target=self._generate_thumbnails, daemon=True).start()
+        # 计算每行显示的缩略图数量
+        thumbnails_per_row = 4
+        thumbnail_size = (150, 200)
+        self._thumb_layout = (thumbnails_per_row, thumbnail_size)
+        self._thumb_color = self.color_preview_var.get()
         
-    def _generate_thumbnails(self):
-        """生成缩略图（在后台线程中运行）"""
-        try:
-            total_pages = len(self.pdf_document)
-            
-            # 计算每行显示的缩略图数量
-            thumbnails_per_row = 4
-            thumbnail_size = (150, 200)
+        # 后台线程生产缩略图数据，主线程定时分批取出创建控件；
+        # 队列有上限，界面处理不过来时后台线程会阻塞等待
+        thumb_queue = queue.Queue(maxsize=THUMB_QUEUE_SIZE)
+        self._thumb_queue = thumb_queue
+        self.parent.after(THUMB_PUMP_INTERVAL_MS, self._pump_thumbnails, thumb_queue)
+        
+        # 在新线程中生成缩略图，避免界面卡顿；文件、缓存键和颜色模式按当前状态传入，
+        # 后台线程不再读取可能被重新加载或切换颜色改掉的实例属性
+        threading.Thread(target=self._generate_thumbnails,
+                         args=(thumb_queue, self.pdf_path, self._thumb_cache_key, self._thumb_color,
+                               len(self.pdf_document), thumbnail_size),
+                         daemon=True).start()
+        
+    def _pump_thumbnails(self, thumb_queue):
+        """在主线程中从队列取出缩略图数据并创建控件，每次最多处理THUMB_PUMP_BATCH项"""
+        if thumb_queue is not self._thumb_queue:
+            # 已重新加载其他文件
+            return
+        
+        thumbnails_per_row, thumbnail_size = self._thumb_layout
+        for _ in range(THUMB_PUMP_BATCH):
+            try:
+                item = thumb_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if item is None:
+                # 生产结束，释放MuPDF缓存
+                self._thumb_queue = None
+                fitz.TOOLS.store_shrink(100)
+                return
             
+            page_num, img_data = item
+            if img_data is None:
+                self._create_single_thumbnail(page_num, thumbnails_per_row, thumbnail_size)
+            else:
+                self._finalize_thumbnail(page_num, img_data, thumbnails_per_row, thumbnail_size)
+        
+        self.parent.after(THUMB_PUMP_INTERVAL_MS, self._pump_thumbnails, thumb_queue)
+    
+    def _generate_thumbnails(self, thumb_queue, pdf_path, cache_key, color, total_pages, thumbnail_size):
+        """生成缩略图（在后台线程中运行）
+        
+        命中磁盘缓存的页面直接读取缓存；未命中的页面较多且为多核时，按块分发到进程池
+        并行渲染，结果写入缓存后交给主线程创建控件；否则交给主线程逐页渲染，
+        避免为少量页面启动进程池。
+        
+        Args:
+            thumb_queue: 与主线程共享的有界队列，放入 (页码, 图像数据)，
+                图像数据为None表示由主线程渲染，结束时放入None
+            pdf_path, cache_key, color, total_pages, thumbnail_size: 启动时的文件、
+                缓存键、颜色模式、页数和缩略图尺寸，整个生成过程只使用这些值
+        """
+        def stale():
+            # 已重新加载文件或切换颜色模式，本次生成的结果不再需要
+            return thumb_queue is not self._thumb_queue
+        
+        def post(item):
+            # 队列满时阻塞等待；期间若已过期则放弃
+            while True:
+                if stale():
+                    return False
+                try:
+                    thumb_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+        
+        try:
+            # 先处理缓存命中的页面
+            pending_pages = []
             for page_num in range(total_pages):
-                # 在主线程中更新UI
-                self.parent.after(0, self._create_single_thumbnail, page_num, thumbnails_per_row, thumbnail_size)
+                img_data = _load_cached_thumbnail(_thumb_cache_path(cache_key, page_num, thumbnail_size, color))
+                if img_data is None:
+                    pending_pages.append(page_num)
+                elif not post((page_num, img_data)):
+                    return
+            
+            max_workers = min(os.cpu_count() or 1, 4)
+            if max_workers <= 1 or len(pending_pages) < THUMB_POOL_MIN_PAGES:
+                for page_num in pending_pages:
+                    # 由主线程渲染
+                    if not post((page_num, None)):
+                        return
+                return
+            
+            chunks = [pending_pages[i:i + THUMB_PAGES_PER_TASK]
+                      for i in range(0, len(pending_pages), THUMB_PAGES_PER_TASK)]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_render_pages_worker, pdf_path, chunk, thumbnail_size, color)
+                           for chunk in chunks]
+                for future in as_completed(futures):
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"渲染缩略图失败: {e}")
+                        continue
+                    for page_num, img_data in results:
+                        if img_data is None:
+                            continue
+                        # 交给主线程创建控件；过期后既不显示也不写入缓存
+                        if not post((page_num, img_data)) or stale():
+                            for pending in futures:
+                                pending.cancel()
+                            return
+                        _store_cached_thumbnail(_thumb_cache_path(cache_key, page_num, thumbnail_size, color),
+                                                img_data)
+            
+            _evict_thumb_cache()
                 
         except Exception as e:
-            self.parent.after(0, lambda: messagebox.showerror("错误", f"生成缩略图失败: {str(e)}"))
+            error_message = f"生成缩略图失败: {str(e)}"
+            self.parent.after(0, lambda: messagebox.showerror("错误", error_message))
+        finally:
+            post(None)
             
     def _create_single_thumbnail(self, page_num, thumbnails_per_row, thumbnail_size):
-        """创建单个页面的缩略图"""
+        """在当前进程中渲染并创建单个页面的缩略图，优先使用磁盘缓存"""
+        cache_path = _thumb_cache_path(self._thumb_cache_key, page_num, thumbnail_size, self._thumb_color)
+        img_data = _load_cached_thumbnail(cache_path)
+        if img_data is not None:
+            self._finalize_thumbnail(page_num, img_data, thumbnails_per_row, thumbnail_size)
+            return
+        
         try:
             page = self.pdf_document[page_num]
             
-            # 生成页面图像
-            mat = fitz.Matrix(0.5, 0.5)  # 缩放矩阵
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("ppm")
-            
-            # 转换为PIL图像
-            pil_image = Image.open(io.BytesIO(img_data))
-            pil_image.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
-            
-            # 转换为Tkinter可用的图像
-            tk_image = ImageTk.PhotoImage(pil_image)
+            # 直接按缩略图尺寸渲染，无需再缩放
+            img_data = _render_thumbnail(page, thumbnail_size, self._thumb_color)
+            _store_cached_thumbnail(cache_path, img_data)
+            if page_num == len(self.pdf_document) - 1:
+                _evict_thumb_cache()
+        except Exception as e:
+            print(f"创建第{page_num + 1}页缩略图失败: {str(e)}")
+            return
+        
+        self._finalize_thumbnail(page_num, img_data, thumbnails_per_row, thumbnail_size)
+    
+    def _finalize_thumbnail(self, page_num, img_data, thumbnails_per_row, thumbnail_size):
+        """根据渲染好的图像数据创建缩略图控件（必须在主线程中调用）
+        
+        Args:
+            img_data: (图像模式, 宽, 高, 原始像素数据)
+        """
+        # 已释放的页面重建时沿用原来的选择状态
+        existing = self.page_thumbnails.get(page_num)
+        if existing is not None and existing['frame'] is not None:
+            return
+        page_var = existing['var'] if existing is not None else tk.BooleanVar()
+        
+        # 不在可视区域附近的页面只登记选择状态，滚动到附近时再创建控件
+        row = page_num // thumbnails_per_row
+        if self._thumb_row_height is not None:
+            first_row, last_row = self._visible_thumb_rows()
+            if not first_row <= row <= last_row:
+                self.page_thumbnails[page_num] = {'image': None, 'var': page_var, 'frame': None}
+                return
+        
+        try:
+            # 原始像素加上PGM/PPM文件头直接交给Tk解析，无需经过PIL
+            mode, width, height, samples = img_data
+            magic = "P5" if mode == "L" else "P6"
+            tk_image = tk.PhotoImage(data=f"{magic} {width} {height} 255 ".encode("ascii") + samples)
             
             # 计算位置
-            row = page_num // thumbnails_per_row
             col = page_num % thumbnails_per_row
             
             # 创建页面框架
@@ -227,9 +520,8 @@ class PDFOperations:
             page_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
             
             # 页面选择复选框
-            page_var = tk.BooleanVar()
             checkbox = ttk.Checkbutton(page_frame, text=f"第{page_num + 1}页", variable=page_var,
-                                     command=lambda p=page_num, v=page_var: self._on_page_select(p, v))
+                                     command=partial(self._on_page_select, page_num, page_var))
             checkbox.pack(pady=(5, 0))
             
             # 页面缩略图
@@ -239,20 +531,65 @@ class PDFOperations:
             # 绑定双击事件
             img_label.bind("<Double-Button-1>", lambda e, p=page_num: self.show_large_image(p))
             
-            # 为所有子组件绑定鼠标滚轮事件
-            page_frame.bind("<MouseWheel>", self._on_mousewheel)
-            checkbox.bind("<MouseWheel>", self._on_mousewheel)
-            img_label.bind("<MouseWheel>", self._on_mousewheel)
-            
-            # 保存引用，防止图像被垃圾回收
-            self.page_thumbnails.append({
+            # 保存引用，防止图像被垃圾回收（按页码索引，渲染完成顺序不固定）
+            self.page_thumbnails[page_num] = {
                 'image': tk_image,
                 'var': page_var,
                 'frame': page_frame
-            })
+            }
+            
+            # 以第一个缩略图（按满尺寸图像折算）固定所有行高和列宽，
+            # 释放控件后网格尺寸保持不变，滚动区域可直接算出
+            if self._thumb_row_height is None:
+                page_frame.update_idletasks()
+                self._thumb_row_height = page_frame.winfo_reqheight() + thumbnail_size[1] - height + 10
+                column_width = page_frame.winfo_reqwidth() + thumbnail_size[0] - width + 10
+                total_rows = -(-len(self.pdf_document) // thumbnails_per_row)
+                for r in range(total_rows):
+                    self.scrollable_frame.grid_rowconfigure(r, minsize=self._thumb_row_height)
+                for c in range(thumbnails_per_row):
+                    self.scrollable_frame.grid_columnconfigure(c, minsize=column_width)
+                self.canvas.configure(scrollregion=(0, 0, column_width * thumbnails_per_row,
+                                                    self._thumb_row_height * total_rows))
             
         except Exception as e:
             print(f"创建第{page_num + 1}页缩略图失败: {str(e)}")
+    
+    def _visible_thumb_rows(self):
+        """计算可视区域（含上下余量）覆盖的缩略图行范围"""
+        thumbnails_per_row = self._thumb_layout[0]
+        total_rows = -(-len(self.pdf_document) // thumbnails_per_row)
+        top, bottom = self.canvas.yview()
+        first_row = int(top * total_rows) - THUMB_KEEP_MARGIN_ROWS
+        last_row = int(bottom * total_rows) + THUMB_KEEP_MARGIN_ROWS
+        return first_row, last_row
+    
+    def _schedule_thumbnail_refresh(self):
+        """合并连续的滚动事件，稍后统一刷新缩略图"""
+        if self._thumb_refresh_after_id is not None:
+            self.canvas.after_cancel(self._thumb_refresh_after_id)
+        self._thumb_refresh_after_id = self.canvas.after(50, self._refresh_visible_thumbnails)
+    
+    def _refresh_visible_thumbnails(self):
+        """释放远离可视区域的缩略图，重建滚动到可视区域附近的缩略图"""
+        self._thumb_refresh_after_id = None
+        if not self.pdf_document or self._thumb_layout is None or self._thumb_row_height is None:
+            return
+        if not self.canvas.winfo_exists():
+            return
+        
+        thumbnails_per_row, thumbnail_size = self._thumb_layout
+        first_row, last_row = self._visible_thumb_rows()
+        for page_num, thumbnail in list(self.page_thumbnails.items()):
+            row = page_num // thumbnails_per_row
+            if first_row <= row <= last_row:
+                if thumbnail['frame'] is None:
+                    # 重建时优先读取磁盘缓存
+                    self._create_single_thumbnail(page_num, thumbnails_per_row, thumbnail_size)
+            elif thumbnail['frame'] is not None:
+                thumbnail['frame'].destroy()
+                thumbnail['frame'] = None
+                thumbnail['image'] = None
             
     def _on_page_select(self, page_num, var):
         """页面选择状态改变时的回调"""
@@ -263,25 +600,25 @@ class PDFOperations:
             
     def select_all_pages(self):
         """全选所有页面"""
-        for i, thumbnail in enumerate(self.page_thumbnails):
+        for page_num, thumbnail in self.page_thumbnails.items():
             thumbnail['var'].set(True)
-            self.selected_pages.add(i)
+            self.selected_pages.add(page_num)
             
     def deselect_all_pages(self):
         """取消选择所有页面"""
-        for thumbnail in self.page_thumbnails:
+        for thumbnail in self.page_thumbnails.values():
             thumbnail['var'].set(False)
         self.selected_pages.clear()
         
     def invert_selection(self):
         """反选"""
-        for i, thumbnail in enumerate(self.page_thumbnails):
+        for page_num, thumbnail in self.page_thumbnails.items():
             current_state = thumbnail['var'].get()
             thumbnail['var'].set(not current_state)
             if current_state:
-                self.selected_pages.discard(i)
+                self.selected_pages.discard(page_num)
             else:
-                self.selected_pages.add(i)
+                self.selected_pages.add(page_num)
                 
     def show_large_image(self, page_num):
         """显示页面大图"""
@@ -322,27 +659,36 @@ class PDFOperations:
             image_container = ttk.Frame(main_container)
             image_container.pack(fill=tk.BOTH, expand=True)
             
+            # 获取图像显示区域尺寸（窗口尺寸减去边距、滚动条、标题栏和导航按钮）
+            def get_display_size():
+                window_width = large_window.winfo_width()
+                window_height = large_window.winfo_height()
+                if window_width <= 1 or window_height <= 1:
+                    # 窗口尚未显示时使用初始尺寸
+                    window_width, window_height = 800, 950
+                return max(window_width - 60, 1), max(window_height - 170, 1)
+            
             # 定义更新图像的函数
             def update_image(new_page_num):
                 try:
                     # 获取页面
                     page = self.pdf_document[new_page_num - 1]
                     
-                    # 生成高分辨率图像
-                    mat = fitz.Matrix(2.0, 2.0)  # 2倍缩放
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("ppm")
+                    # 直接按当前显示区域尺寸渲染，避免先放大渲染再缩小
+                    zoom = _fit_zoom(page, get_display_size())
+                    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False)
                     
-                    # 转换为PIL图像
-                    pil_image = Image.open(io.BytesIO(img_data))
+                    # 原始RGB像素直接构建PIL图像
+                    pil_image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                    pix = None
                     
-                    return pil_image, img_data
+                    return pil_image
                 except Exception as e:
                     messagebox.showerror("错误", f"加载页面失败：{str(e)}")
-                    return None, None
+                    return None
             
             # 初始化图像
-            pil_image, img_data = update_image(page_num)
+            pil_image = update_image(page_num)
             if pil_image is None:
                 return
             
@@ -356,22 +702,21 @@ class PDFOperations:
             img_label = None
             
             # 定义显示图像的函数
-            def display_image(pil_img, img_data_bytes):
+            def display_image(pil_img):
                 nonlocal img_label
                 
-                # 获取窗口尺寸（减去边距和滚动条空间）
-                window_width = 800 - 60  # 减去左右边距和滚动条
-                window_height = 900 - 120  # 减去上下边距、标题栏和导航按钮
+                # 获取显示区域尺寸
+                window_width, window_height = get_display_size()
                 
                 # 计算缩放比例以适应窗口宽度
                 img_width, img_height = pil_img.size
                 scale_factor = min(window_width / img_width, window_height / img_height, 1.0)
                 
-                # 如果需要缩放，则调整图像大小
+                # 如果需要缩放，则调整图像大小（渲染尺寸已接近目标，双线性插值即可）
                 if scale_factor < 1.0:
                     new_width = int(img_width * scale_factor)
                     new_height = int(img_height * scale_factor)
-                    pil_img = pil_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                    pil_img = pil_img.resize((new_width, new_height), Image.Resampling.BILINEAR, reducing_gap=2.0)
                 
                 # 转换为Tkinter图像
                 tk_image = ImageTk.PhotoImage(pil_img)
@@ -386,10 +731,10 @@ class PDFOperations:
                 # 保持图像引用
                 img_label.image = tk_image
                 
-                return img_width, img_height, img_data_bytes
+                return img_width, img_height
             
             # 显示初始图像
-            original_img_width, original_img_height, current_img_data = display_image(pil_image, img_data)
+            original_img_width, original_img_height = display_image(pil_image)
             
             # 定义导航按钮的功能
             def go_to_prev_page():
@@ -397,9 +742,9 @@ class PDFOperations:
                 if current_val > 1:
                     new_page = current_val - 1
                     current_page.set(new_page)
-                    new_pil_image, new_img_data = update_image(new_page)
+                    new_pil_image = update_image(new_page)
                     if new_pil_image is not None:
-                        display_image(new_pil_image, new_img_data)
+                        display_image(new_pil_image)
                         page_info_label.config(text=f"第 {new_page} 页 / 共 {len(self.pdf_document)} 页")
                         large_window.title(f"PDF页面预览 - 第{new_page}页 (共{len(self.pdf_document)}页)")
                         update_button_states()
@@ -409,9 +754,9 @@ class PDFOperations:
                 if current_val < len(self.pdf_document):
                     new_page = current_val + 1
                     current_page.set(new_page)
-                    new_pil_image, new_img_data = update_image(new_page)
+                    new_pil_image = update_image(new_page)
                     if new_pil_image is not None:
-                        display_image(new_pil_image, new_img_data)
+                        display_image(new_pil_image)
                         page_info_label.config(text=f"第 {new_page} 页 / 共 {len(self.pdf_document)} 页")
                         large_window.title(f"PDF页面预览 - 第{new_page}页 (共{len(self.pdf_document)}页)")
                         update_button_states()
@@ -452,16 +797,46 @@ class PDFOperations:
             scrollbar_h.pack(side="bottom", fill="x")
             
             # 添加窗口大小变化时的动态调整
+            resize_after_id = None
+            last_rendered_wh = (800, 950)
+            
+            def rerender_current_page():
+                nonlocal resize_after_id, last_rendered_wh
+                resize_after_id = None
+                if not large_window.winfo_exists():
+                    return
+                last_rendered_wh = (large_window.winfo_width(), large_window.winfo_height())
+                # 重新获取当前页面并重新显示
+                current_val = current_page.get()
+                new_pil_image = update_image(current_val)
+                if new_pil_image is not None:
+                    display_image(new_pil_image)
+            
             def on_window_resize(event):
+                nonlocal resize_after_id
                 if event.widget == large_window:
-                    # 重新获取当前页面并重新显示
-                    current_val = current_page.get()
-                    new_pil_image, new_img_data = update_image(current_val)
-                    if new_pil_image is not None:
-                        display_image(new_pil_image, new_img_data)
+                    # 仅移动窗口或尺寸与上次渲染时相同，无需重新渲染
+                    if (event.width, event.height) == last_rendered_wh:
+                        if resize_after_id is not None:
+                            large_window.after_cancel(resize_after_id)
+                            resize_after_id = None
+                        return
+                    # 拖动窗口时会连续触发，停止变化150毫秒后再重新渲染
+                    if resize_after_id is not None:
+                        large_window.after_cancel(resize_after_id)
+                    resize_after_id = large_window.after(150, rerender_current_page)
             
             large_window.bind("<Configure>", on_window_resize)
             
+            # 关闭预览窗口时取消待执行的重新渲染，并一次性释放MuPDF缓存
+            def on_close():
+                if resize_after_id is not None:
+                    large_window.after_cancel(resize_after_id)
+                large_window.destroy()
+                fitz.TOOLS.store_shrink(100)
+            
+            large_window.protocol("WM_DELETE_WINDOW", on_close)
+            
             # 绑定鼠标滚轮事件
             def on_mousewheel(event):
                 canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -510,33 +885,59 @@ class PDFOperations:
         if not save_path:
             return
             
+        # MuPDF不能以非增量方式保存到已打开的源文件，保存路径可能就是源文件，
+        # 因此先写入同目录的临时文件，关闭文档后再替换目标文件
+        tmp_path = None
         try:
-            # 创建新的PDF文档
-            new_doc = fitz.open()
-            
-            # 复制未选中的页面到新文档
-            for page_num in range(len(self.pdf_document)):
-                if page_num not in self.selected_pages:
-                    new_doc.insert_pdf(self.pdf_document, from_page=page_num, to_page=page_num)
-                    
-            # 保存新文档
-            new_doc.save(save_path)
-            new_doc.close()
+            fd, tmp_path = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(os.path.abspath(save_path)))
+            os.close(fd)
+            
+            # 重新打开源文件并直接删除选中页面，已加载的文档保持不变
+            doc = fitz.open(self.pdf_path)
+            try:
+                doc.delete_pages(sorted(self.selected_pages))
+                # 保存新文档（清理无用对象并压缩）
+                doc.save(tmp_path, garbage=4, deflate=True, clean=True)
+            finally:
+                doc.close()
+            
+            # 覆盖当前加载的文件时先关闭它，Windows下打开中的文件无法被替换
+            if os.path.exists(save_path) and os.path.samefile(save_path, self.pdf_path):
+                self.pdf_document.close()
+                self.pdf_document = None
+            os.replace(tmp_path, save_path)
+            tmp_path = None
+            
+            # 先重新加载页面，弹出提示期间界面不会访问已关闭的文档
+            self.pdf_path = save_path
+            self.file_path_var.set(save_path)
+            self.load_pdf_pages()
             
             messagebox.showinfo("成功", f"页面删除完成！\n\n"
                               f"删除了 {selected_count} 个页面\n"
                               f"保存路径: {save_path}")
             
-            # 重新加载页面（可选）
-            self.pdf_path = save_path
-            self.file_path_var.set(save_path)
-            self.load_pdf_pages()
-            
         except Exception as e:
             messagebox.showerror("错误", f"删除页面失败: {str(e)}")
+            if self.pdf_document is None:
+                # 源文件已关闭但未被替换，重新加载
+                self.load_pdf_pages()
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             
     def _on_mousewheel(self, event):
-        """鼠标滚轮事件处理"""
+        """鼠标滚轮事件处理（全局绑定，仅在鼠标位于预览区域内时滚动）"""
+        if not self.canvas.winfo_exists():
+            return None
+        try:
+            widget = self.canvas.winfo_containing(event.x_root, event.y_root)
+        except (KeyError, tk.TclError):
+            widget = None
+        canvas_path = str(self.canvas)
+        if widget is None or not (str(widget) == canvas_path or str(widget).startswith(canvas_path + ".")):
+            return None
+        
         # 确保canvas有焦点
         self.canvas.focus_set()
         # 滚动canvas
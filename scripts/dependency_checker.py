@@ -5,40 +5,110 @@
 用于检查项目所需的Python包和系统依赖
 """
 
+import asyncio
 import importlib
+import importlib.metadata
+import importlib.util
+import shutil
 import subprocess
 import sys
-from typing import Dict, List, Tuple
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def _pkg_available(import_name: str) -> bool:
+    """查找Python包是否可用（结果按进程缓存）
+    
+    使用find_spec只查找模块位置，不执行模块代码，
+    避免导入torch、paddleocr等大型包的耗时和内存开销。
+    """
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        # 父包导入失败或模块的__spec__异常
+        return False
+
+
+@lru_cache(maxsize=None)
+def _dist_version(package_name: str) -> Optional[str]:
+    """从安装元数据读取包的版本号（结果按进程缓存）
+    
+    tkinter等随Python分发的模块没有安装元数据，缓存后查找失败的异常只会发生一次。
+    """
+    try:
+        return importlib.metadata.version(package_name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+async def _probe_version(command: str, timeout: float = 2) -> Optional[str]:
+    """异步运行 command --version，返回输出的第一行，失败或超时返回None"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            command, '--version',
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    except OSError:
+        return None
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0:
+        return None
+    output = (stdout or stderr).decode(errors='replace').strip()
+    return output.splitlines()[0] if output else ""
+
+
+async def _probe_versions(commands: List[str]) -> List[Optional[str]]:
+    """同时启动所有版本探测，总耗时取决于最慢的一项（最多timeout秒）"""
+    return await asyncio.gather(*(_probe_version(command) for command in commands))
+
+
+# 必需的Python包（导入名称 -> pip包名），只读
+_REQUIRED = MappingProxyType({
+    'tkinter': 'tkinter',
+    'PIL': 'Pillow',
+    'fitz': 'PyMuPDF',
+    'docx': 'python-docx',
+    'pptx': 'python-pptx',
+    'cv2': 'opencv-python',
+    'numpy': 'numpy',
+    'requests': 'requests'
+})
+
+# 可选的Python包
+_OPTIONAL = MappingProxyType({
+    'paddleocr': 'paddleocr',
+    'easyocr': 'easyocr',
+    'torch': 'torch',
+    'torchvision': 'torchvision'
+})
+
+# 导入名称与安装包名不同时，用于查找安装元数据
+_DIST_NAMES = MappingProxyType({**_REQUIRED, **_OPTIONAL})
+
+# 系统依赖
+_SYSTEM = (
+    'tesseract',  # OCR引擎
+)
 
 
 class DependencyChecker:
     """依赖检查器类"""
     
     def __init__(self):
-        # 必需的Python包
-        self.required_packages = {
-            'tkinter': 'tkinter',
-            'PIL': 'Pillow',
-            'fitz': 'PyMuPDF',
-            'docx': 'python-docx',
-            'pptx': 'python-pptx',
-            'cv2': 'opencv-python',
-            'numpy': 'numpy',
-            'requests': 'requests'
-        }
-        
-        # 可选的Python包
-        self.optional_packages = {
-            'paddleocr': 'paddleocr',
-            'easyocr': 'easyocr',
-            'torch': 'torch',
-            'torchvision': 'torchvision'
-        }
+        # 依赖表为模块级只读常量，实例之间共享
+        self.required_packages = _REQUIRED
+        self.optional_packages = _OPTIONAL
+        self.system_dependencies = _SYSTEM
         
-        # 系统依赖
-        self.system_dependencies = [
-            'tesseract'  # OCR引擎
-        ]
+        # 最近一次check_all的结果
+        self.check_results = []
     
     def check_python_package(self, import_name: str) -> bool:
         """检查Python包是否可用
@@ -49,72 +119,184 @@ class DependencyChecker:
         Returns:
             bool: 包是否可用
         """
-        try:
-            importlib.import_module(import_name)
-            return True
-        except ImportError:
-            return False
+        return _pkg_available(import_name)
+    
+    def get_package_version(self, package_name: str) -> Optional[str]:
+        """获取已安装包的版本号
+        
+        从安装元数据中读取，不导入包本身。
+        
+        Args:
+            package_name: pip包名
+            
+        Returns:
+            str: 版本号，未安装或无法获取时返回None
+        """
+        return _dist_version(package_name)
+    
+    def check_python_dependency(self, import_name: str) -> Tuple[bool, Optional[str]]:
+        """检查Python包是否可用并获取其版本号，全程不导入包本身
+        
+        Args:
+            import_name: 导入名称
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (是否可用, 版本号)，版本号无法获取时为None
+        """
+        if not self.check_python_package(import_name):
+            return False, None
+        return True, self.get_package_version(_DIST_NAMES.get(import_name, import_name))
     
-    def check_system_dependency(self, command: str) -> bool:
+    def check_system_dependency(self, command: str, need_version: bool = False) -> bool:
         """检查系统依赖是否可用
         
+        默认只在PATH中查找命令，不启动子进程。
+        
         Args:
             command: 命令名称
+            need_version: 是否同时要求命令能正常输出版本信息
             
         Returns:
             bool: 依赖是否可用
         """
-        try:
-            subprocess.run([command, '--version'], 
-                         capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if shutil.which(command) is None:
             return False
+        if need_version:
+            return self.get_system_dependency_version(command) is not None
+        return True
+    
+    def get_system_dependency_version(self, command: str) -> Optional[str]:
+        """运行命令获取系统依赖的版本信息
+        
+        Args:
+            command: 命令名称
+            
+        Returns:
+            str: 版本信息的第一行，命令不可用或超时时返回None
+        """
+        return asyncio.run(_probe_version(command))
+    
+    def get_system_dependency_versions(self, commands: List[str]) -> Dict[str, Optional[str]]:
+        """并发获取多个系统依赖的版本信息
+        
+        Args:
+            commands: 命令名称列表
+            
+        Returns:
+            Dict[str, Optional[str]]: 命令名称到版本信息的映射，不可用或超时的为None
+        """
+        if not commands:
+            return {}
+        return dict(zip(commands, asyncio.run(_probe_versions(commands))))
+    
+    def probe_python(self, packages: Dict[str, str]) -> List[Tuple[str, str, bool]]:
+        """检查一组Python包是否可用
+        
+        Args:
+            packages: 导入名称到pip包名的映射
+            
+        Returns:
+            List[Tuple[str, str, bool]]: (导入名称, 包名, 是否可用) 列表，顺序与packages一致
+        """
+        return [(import_name, package_name, self.check_python_package(import_name))
+                for import_name, package_name in packages.items()]
+    
+    def check_system_dependencies(self, need_version: bool = False) -> Dict[str, bool]:
+        """检查所有系统依赖
+        
+        先在PATH中查找命令；need_version时再并发运行找到的命令获取版本，
+        每个命令最多等待2秒，总耗时取决于最慢的一项。
+        
+        Args:
+            need_version: 是否同时要求命令能正常输出版本信息
+            
+        Returns:
+            Dict[str, bool]: 依赖名称到是否可用的映射，顺序与system_dependencies一致
+        """
+        if not self.system_dependencies:
+            return {}
+        
+        results = {dependency: shutil.which(dependency) is not None 
+                   for dependency in self.system_dependencies}
+        if need_version:
+            found = [dependency for dependency, available in results.items() if available]
+            for dependency, version in self.get_system_dependency_versions(found).items():
+                results[dependency] = version is not None
+        return results
     
-    def check_all(self, verbose: bool = False) -> bool:
+    def check_all(self, verbose: bool = False, show_versions: bool = False) -> bool:
         """检查所有依赖
         
+        检查结果以 (类别, 名称, 导入名, 是否可用, 版本) 元组保存在check_results中，
+        只有verbose时才生成文字报告。
+        
         Args:
             verbose: 是否显示详细信息
+            show_versions: 详细信息中是否显示已安装包的版本号
             
         Returns:
             bool: 所有必需依赖是否都可用
         """
-        all_ok = True
+        want_versions = verbose and show_versions
+        results = []
         
-        if verbose:
-            print("\n📦 检查Python包...")
-        
-        # 检查必需的Python包
-        for import_name, package_name in self.required_packages.items():
-            available = self.check_python_package(import_name)
-            if verbose:
-                status = "✅" if available else "❌"
-                print(f"  {status} {package_name} ({import_name})")
-            if not available:
-                all_ok = False
+        # 检查必需的和可选的Python包
+        for category, packages in (('required', self.required_packages), 
+                                   ('optional', self.optional_packages)):
+            for import_name, package_name, available in self.probe_python(packages):
+                version = self.get_package_version(package_name) if want_versions and available else None
+                results.append((category, package_name, import_name, available, version))
         
-        if verbose:
-            print("\n🔧 检查可选Python包...")
+        # 检查系统依赖
+        for dependency, available in self.check_system_dependencies().items():
+            results.append(('system', dependency, dependency, available, None))
         
-        # 检查可选的Python包
-        for import_name, package_name in self.optional_packages.items():
-            available = self.check_python_package(import_name)
-            if verbose:
-                status = "✅" if available else "⚠️"
-                print(f"  {status} {package_name} ({import_name}) [可选]")
+        self.check_results = results
         
         if verbose:
-            print("\n🖥️  检查系统依赖...")
+            self.print_report()
         
-        # 检查系统依赖
-        for dependency in self.system_dependencies:
-            available = self.check_system_dependency(dependency)
-            if verbose:
-                status = "✅" if available else "⚠️"
-                print(f"  {status} {dependency} [可选]")
+        return all(available for category, _, _, available, _ in results if category == 'required')
+    
+    def print_report(self, out=None):
+        """将最近一次check_all的结果逐行写入out（默认标准输出）"""
+        out = out if out is not None else sys.stdout
+        for line in self._iter_report():
+            print(line, file=out)
+    
+    def _iter_report(self):
+        """逐行生成check_results的文字报告"""
+        sections = {
+            'required': ("\n📦 检查Python包...", "❌", ""),
+            'optional': ("\n🔧 检查可选Python包...", "⚠️", " [可选]"),
+            'system': ("\n🖥️  检查系统依赖...", "⚠️", " [可选]"),
+        }
+        current = None
+        for category, name, import_name, available, version in self.check_results:
+            title, missing_mark, suffix = sections[category]
+            if category != current:
+                current = category
+                yield title
+            
+            status = "✅" if available else missing_mark
+            version_info = f" {version}" if version else ""
+            import_info = f" ({import_name})" if category != 'system' else ""
+            yield f"  {status} {name}{version_info}{import_info}{suffix}"
+    
+    def get_full_results(self) -> Dict[str, Dict[str, dict]]:
+        """以嵌套字典形式返回最近一次check_all的结果
         
-        return all_ok
+        Returns:
+            Dict[str, Dict[str, dict]]: 类别 -> 名称 -> {import_name, available, version}
+        """
+        full_results = {'required': {}, 'optional': {}, 'system': {}}
+        for category, name, import_name, available, version in self.check_results:
+            full_results[category][name] = {
+                'import_name': import_name,
+                'available': available,
+                'version': version
+            }
+        return full_results
     
     def get_missing_dependencies(self) -> Dict[str, List[str]]:
         """获取缺失的依赖列表
@@ -128,13 +310,13 @@ class DependencyChecker:
         }
         
         # 检查Python包
-        for import_name, package_name in self.required_packages.items():
-            if not self.check_python_package(import_name):
+        for import_name, package_name, available in self.probe_python(self.required_packages):
+            if not available:
                 missing['python'].append(package_name)
         
         # 检查系统依赖
-        for dependency in self.system_dependencies:
-            if not self.check_system_dependency(dependency):
+        for dependency, available in self.check_system_dependencies().items():
+            if not available:
                 missing['system'].append(dependency)
         
         return missing
@@ -154,24 +336,49 @@ class DependencyChecker:
         print(f"📦 正在安装缺失的包: {', '.join(missing['python'])}")
         
         try:
-            for package in missing['python']:
-                print(f"  安装 {package}...")
-                subprocess.run([sys.executable, '-m', 'pip', 'install', package], 
-                             check=True)
+            # 一次调用安装全部缺失的包，进度由pip直接输出
+            subprocess.run([sys.executable, '-m', 'pip', 'install', 
+                            '--disable-pip-version-check', '--no-input', *missing['python']], 
+                         check=True)
             print("✅ 所有包安装完成")
+            # 安装后清除缓存的检查结果
+            invalidate()
             return True
         except subprocess.CalledProcessError as e:
             print(f"❌ 安装失败: {e}")
             return False
 
 
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def _get_checker() -> DependencyChecker:
+    """获取模块共享的DependencyChecker实例（延迟创建，线程安全）"""
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            _checker = DependencyChecker()
+        return _checker
+
+
+def invalidate():
+    """清除共享的检查器和缓存的包检查结果，安装新依赖后调用"""
+    global _checker
+    with _checker_lock:
+        _checker = None
+    _pkg_available.cache_clear()
+    _dist_version.cache_clear()
+    importlib.invalidate_caches()
+
+
 def quick_dependency_check() -> bool:
     """快速依赖检查
     
     Returns:
         bool: 基本依赖是否满足
     """
-    checker = DependencyChecker()
+    checker = _get_checker()
     
     # 检查最基本的依赖
     basic_deps = ['tkinter', 'PIL', 'fitz']
@@ -185,7 +392,7 @@ def quick_dependency_check() -> bool:
 
 if __name__ == "__main__":
     # 命令行使用
-    checker = DependencyChecker()
+    checker = _get_checker()
     
     print("🔍 PDF转换器依赖检查")
     print("=" * 50)
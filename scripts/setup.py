@@ -15,10 +15,10 @@ import os
 import sys
 import subprocess
 import platform
-import urllib.request
-import zipfile
-import shutil
+import shlex
+import importlib.util
 from pathlib import Path
+from typing import List, Union
 
 
 class DependencyInstaller:
@@ -28,6 +28,9 @@ class DependencyInstaller:
         self.system = platform.system()
         self.is_windows = self.system == "Windows"
         self.project_root = Path(__file__).parent
+        # 是否运行在虚拟环境中，以及调用pip的命令前缀
+        self.in_venv = sys.prefix != getattr(sys, 'base_prefix', sys.prefix) or hasattr(sys, 'real_prefix')
+        self.pip_cmd = [sys.executable, '-m', 'pip']
         
     def print_step(self, step_num, description):
         """打印安装步骤"""
@@ -35,14 +38,41 @@ class DependencyInstaller:
         print(f"步骤 {step_num}: {description}")
         print(f"{'='*60}")
         
-    def run_command(self, command, check=True):
-        """执行命令"""
+    def run_command(self, command: Union[List[str], str], check=True, capture=False, timeout=None):
+        """执行命令
+        
+        命令始终直接启动，不经过shell；传入字符串时先按shell规则拆分为参数列表，
+        推荐直接传入参数列表，避免路径中的空格等字符被错误拆分。
+        
+        Args:
+            command: 要执行的命令
+            check: 返回码非0时是否视为失败
+            capture: 是否捕获输出；默认直接输出到终端，用户可看到pip等命令的进度，
+                也不必在内存中保存完整输出
+            timeout: 超时秒数，超时视为失败
+        
+        Returns:
+            (是否成功, 标准输出, 标准错误)，未捕获输出时后两项为空字符串
+        """
+        if isinstance(command, str):
+            command = shlex.split(command, posix=not self.is_windows)
         try:
-            result = subprocess.run(command, shell=True, check=check, 
-                                  capture_output=True, text=True)
-            return result.returncode == 0, result.stdout, result.stderr
+            result = subprocess.run(command, check=check, 
+                                  capture_output=capture, text=True, timeout=timeout)
+            return result.returncode == 0, result.stdout or "", result.stderr or ""
         except subprocess.CalledProcessError as e:
-            return False, e.stdout, e.stderr
+            return False, e.stdout or "", e.stderr or ""
+        except subprocess.TimeoutExpired:
+            return False, "", f"命令超时（{timeout}秒）"
+        except OSError as e:
+            # 命令不存在等情况
+            return False, "", str(e)
+            
+    @staticmethod
+    def _failure_detail(stderr):
+        """失败提示的补充信息：有错误输出时附上，未捕获输出时提示查看上方的命令输出"""
+        stderr = stderr.strip()
+        return f": {stderr}" if stderr else "，详细信息见上方输出"
             
     def check_python_version(self):
         """检查Python版本"""
@@ -62,9 +92,7 @@ class DependencyInstaller:
         self.print_step(2, "安装Python依赖包")
         
         # 检查是否在虚拟环境中
-        in_venv = hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
-        
-        if not in_venv:
+        if not self.in_venv:
             print("⚠️  建议在虚拟环境中安装依赖")
             response = input("是否创建虚拟环境? (y/n): ")
             if response.lower() == 'y':
@@ -73,20 +101,20 @@ class DependencyInstaller:
                 
         # 升级pip
         print("📦 升级pip...")
-        success, stdout, stderr = self.run_command(f"{sys.executable} -m pip install --upgrade pip")
+        success, stdout, stderr = self.run_command(self.pip_cmd + ['install', '--upgrade', 'pip'])
         if not success:
-            print(f"⚠️  pip升级失败: {stderr}")
+            print(f"⚠️  pip升级失败{self._failure_detail(stderr)}")
             
         # 安装依赖
         requirements_file = self.project_root / "requirements.txt"
         if requirements_file.exists():
             print("📦 安装项目依赖...")
-            success, stdout, stderr = self.run_command(f"{sys.executable} -m pip install -r {requirements_file}")
+            success, stdout, stderr = self.run_command(self.pip_cmd + ['install', '-r', str(requirements_file)])
             if success:
                 print("✅ Python依赖安装成功")
                 return True
             else:
-                print(f"❌ 依赖安装失败: {stderr}")
+                print(f"❌ 依赖安装失败{self._failure_detail(stderr)}")
                 return False
         else:
             print("❌ 未找到requirements.txt文件")
@@ -97,7 +125,7 @@ class DependencyInstaller:
         venv_path = self.project_root / ".venv"
         
         print(f"🔧 创建虚拟环境: {venv_path}")
-        success, stdout, stderr = self.run_command(f"{sys.executable} -m venv {venv_path}")
+        success, stdout, stderr = self.run_command([sys.executable, '-m', 'venv', str(venv_path)])
         
         if success:
             print("✅ 虚拟环境创建成功")
@@ -110,7 +138,7 @@ class DependencyInstaller:
                 print(f"\n激活虚拟环境: source {activate_script}")
                 print("然后重新运行: python setup.py")
         else:
-            print(f"❌ 虚拟环境创建失败: {stderr}")
+            print(f"❌ 虚拟环境创建失败{self._failure_detail(stderr)}")
             
     # def check_tesseract(self):
     #     """检查Tesseract安装 - 已移除"""
@@ -124,7 +152,8 @@ class DependencyInstaller:
         """检查Poppler安装"""
         self.print_step(4, "检查Poppler PDF工具")
         
-        success, stdout, stderr = self.run_command("pdftoppm -h", check=False)
+        # 捕获输出，不把帮助信息打印到终端；正常情况下很快返回，超时视为不可用
+        success, stdout, stderr = self.run_command(["pdftoppm", "-h"], check=False, capture=True, timeout=2)
         if success:
             print("✅ Poppler已安装")
             return True
@@ -164,14 +193,25 @@ class DependencyInstaller:
         # 'pdf2image' # 已移除（主要用于OCR功能）
         ]
         
-        failed_imports = []
-        for package in test_imports:
-            try:
-                __import__(package)
-                print(f"✅ {package} 导入成功")
-            except ImportError:
-                print(f"❌ {package} 导入失败")
-                failed_imports.append(package)
+        # 先用find_spec查找（不执行模块代码），找不到的包无需再测试导入
+        present = [package for package in test_imports if importlib.util.find_spec(package) is not None]
+        failed_set = set(test_imports).difference(present)
+        
+        # 找到的包在单独的子进程中统一测试导入，安装程序自身不加载这些包
+        if present:
+            code = "\n".join(f"try:\n    import {package}\nexcept Exception:\n    print({package!r})"
+                             for package in present)
+            result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+            if result.returncode != 0:
+                # 子进程异常退出时无法确认结果，全部视为失败
+                print(f"⚠️  导入测试进程异常退出: {result.stderr.strip()}")
+                failed_set.update(present)
+            else:
+                failed_set.update(result.stdout.split())
+        
+        failed_imports = [package for package in test_imports if package in failed_set]
+        print("\n".join(f"❌ {package} 导入失败" if package in failed_set else f"✅ {package} 导入成功"
+                        for package in test_imports))
                 
         if failed_imports:
             print(f"\n❌ 以下包导入失败: {', '.join(failed_imports)}")
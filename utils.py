@@ -9,6 +9,13 @@ PDF转换器工具模块
 import os
 import sys
 import logging
+import multiprocessing
+import atexit
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 
 # ==================== 配置信息 ====================
 
@@ -34,20 +41,87 @@ APP_CONFIG = {
 
 # ==================== 日志配置 ====================
 
-# 配置日志系统
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(APP_CONFIG['log_file'], encoding=APP_CONFIG['encoding']),
-        logging.StreamHandler()
-    ]
-)
+class BufferedFileHandler(logging.FileHandler):
+    """
+    带写缓冲的日志文件处理器
+    
+    普通FileHandler每条记录都会flush一次；这里日志先写入64 KiB缓冲区，
+    emit在写入ERROR及以上级别的记录后主动flush，其余由后台线程每隔flush_interval秒
+    刷新一次，程序退出时logging.shutdown会关闭处理器并写出剩余内容。
+    """
+    
+    def __init__(self, filename, mode='a', encoding=None, buffer_size=65536,
+                 flush_level=logging.ERROR, flush_interval=30.0):
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self.flush_interval = flush_interval
+        self._closing = threading.Event()
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self._flush_thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flush_thread.start()
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, 
+                    encoding=self.encoding)
+    
+    def emit(self, record):
+        if self.stream is None:
+            if self.mode != 'w' or not getattr(self, '_closed', False):
+                self.stream = self._open()
+            if self.stream is None:
+                return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            # 错误日志不等待定时刷新，写入后立即flush到文件
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        # 先结束刷新线程，再关闭文件
+        self._closing.set()
+        if self._flush_thread is not threading.current_thread():
+            self._flush_thread.join()
+        super().close()
+    
+    def _flush_periodically(self):
+        while not self._closing.wait(self.flush_interval):
+            # 与emit/close使用同一把锁，文件关闭后不再访问；
+            # logging.shutdown会持有该锁调用close，等锁期间发现正在关闭就直接退出
+            while not self.lock.acquire(timeout=0.1):
+                if self._closing.is_set():
+                    return
+            try:
+                if self.stream is not None:
+                    self.stream.flush()
+            finally:
+                self.lock.release()
+
+
+# 配置日志系统；根日志器已有处理器时basicConfig本身不生效，
+# 提前判断以免白白打开日志文件、启动刷新线程。
+# 进程池的子进程（spawn方式会重新导入本模块）也不配置，避免多个进程同时写同一日志文件
+if not logging.root.handlers and multiprocessing.parent_process() is None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            BufferedFileHandler(APP_CONFIG['log_file'], encoding=APP_CONFIG['encoding']),
+            logging.StreamHandler()
+        ]
+    )
 
 logger = logging.getLogger('pdf_converter')
 
 # ==================== 工具函数 ====================
 
+# PyInstaller创建临时文件夹，将路径存储在_MEIPASS中；导入时读取一次，未打包运行时为None
+_MEIPASS = getattr(sys, '_MEIPASS', None)
+
+
 def get_resource_path(relative_path):
     """
     获取资源文件的绝对路径，适用于PyInstaller打包后的情况
@@ -58,13 +132,13 @@ def get_resource_path(relative_path):
     Returns:
         str: 绝对路径
     """
-    try:
-        # PyInstaller创建临时文件夹，将路径存储在_MEIPASS中
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_MEIPASS or os.path.abspath("."), relative_path)
+
+
+@lru_cache(maxsize=256)
+def _base_name(input_path):
+    """返回不带目录和扩展名的文件名，逐页生成路径时同一输入文件只解析一次"""
+    return os.path.splitext(os.path.basename(input_path))[0]
 
 
 def get_output_path(input_path, output_dir, output_format, page_num=None):
@@ -81,10 +155,10 @@ def get_output_path(input_path, output_dir, output_format, page_num=None):
         str: 输出文件路径
     """
     # 获取不带扩展名的文件名
-    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    base_name = _base_name(input_path)
     
     # 如果是图片格式且指定了页码，则添加页码信息
-    if page_num is not None and output_format in ['png', 'jpg']:
+    if page_num is not None and output_format in ('png', 'jpg'):
         file_name = f"{base_name}_page{page_num + 1}.{output_format}"
     else:
         file_name = f"{base_name}.{output_format}"
@@ -92,6 +166,7 @@ def get_output_path(input_path, output_dir, output_format, page_num=None):
     return os.path.join(output_dir, file_name)
 
 
+# 已确认存在的目录，批量转换时同一输出目录只检查一次
 def ensure_dir_exists(directory):
     """
     确保目录存在，如果不存在则创建
@@ -102,45 +177,131 @@ def ensure_dir_exists(directory):
     Returns:
         bool: 创建成功返回True，失败返回False
     """
-    if not os.path.exists(directory):
-        try:
-            os.makedirs(directory)
-            logger.info(f"创建目录: {directory}")
-            return True
-        except Exception as e:
-            logger.error(f"创建目录失败: {directory}, 错误: {str(e)}")
-            return False
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.error(f"创建目录失败: {directory}, 错误: {str(e)}")
+        return False
     return True
 
 
+# PDF文件头标识，规范允许其出现在文件前1024字节内
+_PDF_MAGIC = b'%PDF'
+_PDF_HEADER_WINDOW = 1024
+
+
 def is_valid_pdf(file_path):
     """
     简单检查文件是否为有效的PDF文件
     
+    PDF规范允许文件头出现在前1024字节内的任意位置，因此读取前1 KiB查找PDF标识；
+    文件不存在或为空时读取失败或得到空数据，无需事先单独检查。
+    
     Args:
         file_path (str): PDF文件路径
         
     Returns:
         bool: 有效返回True，无效返回False
     """
-    if not os.path.exists(file_path):
-        return False
-    
     if not file_path.lower().endswith('.pdf'):
         return False
     
-    # 检查文件大小是否大于0
-    if os.path.getsize(file_path) <= 0:
+    try:
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.error(f"检查PDF文件有效性失败: {file_path}, 错误: {str(e)}")
         return False
     
-    # 检查文件头部是否为PDF标识
     try:
-        with open(file_path, 'rb') as f:
-            header = f.read(4)
-            return header == b'%PDF'
-    except Exception as e:
+        header = os.read(fd, _PDF_HEADER_WINDOW)
+    except OSError as e:
         logger.error(f"检查PDF文件有效性失败: {file_path}, 错误: {str(e)}")
         return False
+    finally:
+        os.close(fd)
+    return _PDF_MAGIC in header
+
+
+def is_valid_pdf_many(file_paths, max_workers=8):
+    """
+    批量检查多个文件是否为有效的PDF文件
+    
+    各文件的检查主要是等待磁盘读取，在线程池中并发执行。
+    
+    Args:
+        file_paths (iterable): PDF文件路径
+        max_workers (int): 最大并发线程数
+        
+    Returns:
+        list: 与file_paths顺序一致的检查结果
+    """
+    file_paths = list(file_paths)
+    if len(file_paths) <= 1:
+        return [is_valid_pdf(path) for path in file_paths]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+        return list(executor.map(is_valid_pdf, file_paths))
+
+
+class BackgroundFileWriter:
+    """
+    后台文件写入器，在单独线程中把数据写入磁盘，调用方可以继续处理下一项
+    
+    待写队列有上限，写盘跟不上时submit会阻塞，避免待写数据在内存中无限堆积。
+    """
+    
+    def __init__(self, max_pending=8):
+        """
+        Args:
+            max_pending (int): 最多允许排队等待写入的数据块数量
+        """
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._errors = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def submit(self, path, data):
+        """
+        提交一次写入
+        
+        Args:
+            path (str): 目标文件路径
+            data (bytes): 要写入的数据
+        """
+        self._queue.put((path, data))
+    
+    def drain(self):
+        """
+        等待所有已提交的写入完成并结束后台线程
+        
+        Returns:
+            list: 因OSError写入失败的 (path, error) 列表
+            
+        Raises:
+            Exception: 后台写入时出现的第一个非OSError异常
+        """
+        self._queue.put(None)
+        self._thread.join()
+        for _, error in self._errors:
+            if not isinstance(error, OSError):
+                raise error
+        return self._errors
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            path, data = item
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                # 记录后继续消费队列，否则submit会因队列满而永久阻塞
+                logger.error(f"写入文件失败: {path}, 错误: {str(e)}")
+                self._errors.append((path, e))
 
 
 def get_error_message(error_code):
@@ -166,33 +327,63 @@ def get_app_info():
     return APP_CONFIG.copy()
 
 
+# setup_logging启动的日志后台线程
+_log_listener = None
+
+
 def setup_logging(log_level=logging.INFO, log_file=None):
     """
     重新配置日志系统
     
+    调用方只把日志记录放入队列，由后台线程写入文件和控制台，转换过程不会因写日志而阻塞。
+    
     Args:
         log_level: 日志级别
         log_file (str, optional): 日志文件路径
     """
+    global _log_listener
+    
     if log_file is None:
         log_file = APP_CONFIG['log_file']
     
-    # 清除现有的处理器
+    # 先停止上一次的后台线程，处理完队列中剩余的记录，再关闭其处理器释放日志文件
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+    
+    # 清除现有的处理器，关闭时写出缓冲中的日志
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
+        handler.close()
+    
+    # 日志在QueueHandler中按格式生成文本，后台线程的处理器只负责输出
+    log_queue = queue.Queue(-1)
+    first_setup = _log_listener is None
+    _log_listener = QueueListener(
+        log_queue,
+        BufferedFileHandler(log_file, encoding=APP_CONFIG['encoding']),
+        logging.StreamHandler()
+    )
+    _log_listener.start()
+    if first_setup:
+        atexit.register(_stop_log_listener)
     
     # 重新配置
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding=APP_CONFIG['encoding']),
-            logging.StreamHandler()
-        ],
+        handlers=[QueueHandler(log_queue)],
         force=True
     )
 
 
+def _stop_log_listener():
+    """程序退出时停止日志后台线程，确保队列中的记录都已写出"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
 # ==================== 兼容性支持 ====================
 
 # 为了保持向后兼容，导出原config.py中的变量
@@ -200,10 +391,13 @@ __all__ = [
     'ERROR_MESSAGES',
     'APP_CONFIG', 
     'logger',
+    'BufferedFileHandler',
     'get_resource_path',
     'get_output_path',
     'ensure_dir_exists',
     'is_valid_pdf',
+    'is_valid_pdf_many',
+    'BackgroundFileWriter',
     'get_error_message',
     'get_app_info',
     'setup_logging'